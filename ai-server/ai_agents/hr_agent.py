@@ -1,22 +1,13 @@
-import os
 import re
 import asyncio
-from langchain.agents import initialize_agent, Tool
-from langchain_openai import ChatOpenAI
+import threading
+from langchain_core.tools import Tool
 
 from chains.persona_chain import detect_persona_with_langchain
 from chains.performance_chain import generate_performance_review_with_langchain
 from chains.interview_chain import generate_interview_tasks_with_langchain
 from chains.scoring_chain import score_resume_with_sbert
-
-GROQ_API_KEY = os.getenv("GROQ_API_KEY")
-GROQ_MODEL = "llama3-8b-8192"
-
-llm = ChatOpenAI(
-    api_key=GROQ_API_KEY,
-    base_url="https://api.groq.com/openai/v1",
-    model=GROQ_MODEL
-)
+from services.llm_client import llm_clients
 
 # --- WRAPPER FOR AGENT TOOL ---
 async def score_resume_tool(input_str: str) -> float:
@@ -138,13 +129,28 @@ tools = [
     
 ]
 
-agent = initialize_agent(
-    tools=tools,
-    llm=llm,
-    agent="zero-shot-react-description",
-    handle_parsing_errors=True
-)
+_agent = None
+_agent_lock = threading.Lock()
+
+def get_agent():
+    # Built on first use: langchain.agents is a heavy import that most requests never need
+    global _agent
+    if _agent is None:
+        with _agent_lock:
+            if _agent is None:
+                from langchain.agents import initialize_agent
+
+                _agent = initialize_agent(
+                    tools=tools,
+                    llm=llm_clients.chat_model("agent"),
+                    agent="zero-shot-react-description",
+                    handle_parsing_errors=True
+                )
+    return _agent
+
+def agent_loaded() -> bool:
+    return _agent is not None
 
 async def agent_decide(task: str):
     # The agent will choose the right tool based on the task description
-    return await agent.ainvoke(task)
\ No newline at end of file
+    return await get_agent().ainvoke(task)
\ No newline at end of file
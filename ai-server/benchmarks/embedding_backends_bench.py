@@ -0,0 +1,149 @@
+# Compares embedding backends (torch fp32, ONNX fp32, ONNX int8) on throughput, memory and score parity.
+#
+#   python benchmarks/embedding_backends_bench.py [--texts resumes.txt] [--backends torch onnx onnx-int8]
+#                                                 [--requirements "Python,FastAPI,MongoDB"] [--tolerance 1.0]
+#
+# Each backend runs in its own process so its RSS is measured in isolation. Scores are computed with
+# the production scoring function against the torch baseline; the script exits non-zero when any
+# backend's score differs from the baseline by more than --tolerance points.
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+SAMPLE_TEXTS = [
+    "Backend engineer with 5 years of Python experience building REST APIs with FastAPI and Django.",
+    "Data scientist skilled in machine learning, pandas, scikit-learn and deploying models to production.",
+    "Frontend developer focused on React, TypeScript and accessible design systems.",
+    "DevOps engineer running Kubernetes clusters on AWS with Terraform and GitHub Actions pipelines.",
+    "Full-stack developer who designed MongoDB schemas and led a team of four engineers.",
+    "Mobile developer shipping Android and iOS apps in Kotlin and Swift to millions of users.",
+    "QA engineer automating end-to-end tests with Playwright and maintaining CI test suites.",
+    "Site reliability engineer improving p99 latency and on-call tooling for payment services.",
+]
+
+def _rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except OSError:
+        return 0.0
+
+def read_lines(path: str) -> list:
+    with open(path) as f:
+        return [line.rstrip("\n") for line in f if line.strip()]
+
+def run_worker(backend: str, texts_path: str, requirements_path: str, output_path: str, batch_size: int):
+    # Child process: load one backend, encode the corpus, report timings and memory
+    from chains.scoring_chain import load_embedding_model
+
+    texts = read_lines(texts_path)
+    rss_before = _rss_mb()
+    started = time.perf_counter()
+    model = load_embedding_model(backend)
+    load_seconds = time.perf_counter() - started
+    rss_loaded = _rss_mb()
+
+    model.encode(texts[:batch_size], batch_size=batch_size, normalize_embeddings=True)
+    started = time.perf_counter()
+    embeddings = model.encode(texts, batch_size=batch_size, convert_to_numpy=True, normalize_embeddings=True)
+    encode_seconds = time.perf_counter() - started
+    # Requirements are encoded by the same backend, as they would be in production
+    requirement_embeddings = model.encode(read_lines(requirements_path), convert_to_numpy=True, normalize_embeddings=True)
+    np.savez(output_path, texts=embeddings.astype(np.float32), requirements=requirement_embeddings.astype(np.float32))
+    print(json.dumps({
+        "backend": backend,
+        "load_seconds": round(load_seconds, 2),
+        "sentences_per_second": round(len(texts) / encode_seconds, 1),
+        "model_rss_mb": round(rss_loaded - rss_before, 1),
+        "rss_mb": round(_rss_mb(), 1),
+        # ru_maxrss is in kilobytes on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3, 1)
+    }))
+
+def run_backend(backend: str, texts_path: str, requirements_path: str, output_path: str, batch_size: int) -> dict:
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--worker", backend, texts_path, requirements_path, output_path, str(batch_size)],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        lines = result.stderr.strip().splitlines()
+        return {"backend": backend, "error": lines[-1] if lines else "failed"}
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--worker":
+        backend, texts_path, requirements_path, output_path, batch_size = sys.argv[2:7]
+        run_worker(backend, texts_path, requirements_path, output_path, int(batch_size))
+        return 0
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--texts", help="file with one text per line (default: built-in sample resumes)")
+    parser.add_argument("--backends", nargs="+", default=["torch", "onnx", "onnx-int8"])
+    parser.add_argument("--requirements", default="Python,FastAPI,MongoDB,Kubernetes,React,machine learning")
+    parser.add_argument("--repeat", type=int, default=64, help="times to repeat the sample texts")
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--tolerance", type=float, default=1.0, help="max allowed score difference in points")
+    args = parser.parse_args()
+
+    from chains.scoring_chain import score_embeddings
+
+    with tempfile.TemporaryDirectory() as workdir:
+        texts_path = args.texts
+        if not texts_path:
+            texts_path = os.path.join(workdir, "texts.txt")
+            with open(texts_path, "w") as f:
+                f.write("\n".join(SAMPLE_TEXTS * args.repeat))
+        texts = read_lines(texts_path)
+        requirements = [r.strip() for r in args.requirements.split(",") if r.strip()]
+        requirements_path = os.path.join(workdir, "requirements.txt")
+        with open(requirements_path, "w") as f:
+            f.write("\n".join(requirements))
+        # torch is the reference every other backend is compared against
+        backends = ["torch"] + [b for b in args.backends if b != "torch"]
+
+        reports, scores = [], {}
+        for backend in backends:
+            output_path = os.path.join(workdir, f"{backend}.npz")
+            report = run_backend(backend, texts_path, requirements_path, output_path, args.batch_size)
+            if "error" not in report:
+                arrays = np.load(output_path)
+                scores[backend] = np.array(score_embeddings(texts, arrays["texts"], requirements, arrays["requirements"]))
+            reports.append(report)
+
+    exit_code = 0
+    parity_failed = False
+    baseline = scores.get("torch")
+    print(f"{'backend':<10} {'load s':>7} {'sent/s':>9} {'model MB':>9} {'peak MB':>8} {'max Δscore':>11} {'mean Δscore':>12}")
+    for report in reports:
+        backend = report["backend"]
+        if "error" in report:
+            print(f"{backend:<10} failed: {report['error']}")
+            exit_code = 1
+            continue
+        max_delta = mean_delta = float("nan")
+        if baseline is not None and backend in scores:
+            deltas = np.abs(scores[backend] - baseline)
+            max_delta, mean_delta = float(deltas.max()), float(deltas.mean())
+            if max_delta > args.tolerance:
+                parity_failed = True
+                exit_code = 1
+        print(
+            f"{backend:<10} {report['load_seconds']:>7.2f} {report['sentences_per_second']:>9.1f} "
+            f"{report['model_rss_mb']:>9.1f} {report['peak_rss_mb']:>8.1f} {max_delta:>11.3f} {mean_delta:>12.3f}"
+        )
+    if parity_failed:
+        print(f"parity check failed: a backend differs from torch by more than {args.tolerance} points")
+    return exit_code
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+# Compares PDF text extraction backends on a corpus of PDFs.
+#
+#   python benchmarks/pdf_extraction_bench.py path/to/pdf/fixtures [--backends pypdfium2 pdfminer pdfplumber]
+#
+# Reports documents, pages and pages/sec per backend, plus how often the output would have
+# been rejected as empty/garbled (i.e. how often the fast path falls back to pdfplumber).
+import argparse
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.pdf_extraction import EXTRACTOR_BACKENDS, PDF_MAX_PAGES, looks_garbled
+
+def count_pages(path: str) -> int:
+    try:
+        import pypdfium2 as pdfium
+        pdf = pdfium.PdfDocument(path)
+        try:
+            return min(len(pdf), PDF_MAX_PAGES)
+        finally:
+            pdf.close()
+    except ImportError:
+        import pdfplumber
+        with pdfplumber.open(path) as pdf:
+            return min(len(pdf.pages), PDF_MAX_PAGES)
+
+def run_backend(name: str, paths: list, repeat: int) -> dict:
+    extractor = EXTRACTOR_BACKENDS[name]
+    garbled = failed = 0
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for path in paths:
+            try:
+                if looks_garbled(extractor(path, PDF_MAX_PAGES)):
+                    garbled += 1
+            except ImportError:
+                raise
+            except Exception:
+                failed += 1
+    return {"seconds": time.perf_counter() - started, "garbled": garbled, "failed": failed}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("corpus", help="Directory containing PDF fixtures")
+    parser.add_argument("--backends", nargs="+", default=list(EXTRACTOR_BACKENDS))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(args.corpus, "**", "*.pdf"), recursive=True))
+    if not paths:
+        sys.exit(f"No PDFs found under {args.corpus}")
+    pages = sum(count_pages(path) for path in paths) * args.repeat
+    docs = len(paths) * args.repeat
+
+    print(f"{len(paths)} documents, {pages // args.repeat} pages, {args.repeat} repetition(s)")
+    print(f"{'backend':<12} {'seconds':>9} {'docs/s':>9} {'pages/s':>9} {'garbled':>8} {'failed':>7}")
+    for name in args.backends:
+        try:
+            result = run_backend(name, paths, args.repeat)
+        except ImportError as e:
+            print(f"{name:<12} skipped ({e})")
+            continue
+        seconds = result["seconds"] or 1e-9
+        print(
+            f"{name:<12} {seconds:>9.2f} {docs / seconds:>9.1f} {pages / seconds:>9.1f} "
+            f"{result['garbled']:>8} {result['failed']:>7}"
+        )
+
+if __name__ == "__main__":
+    main()
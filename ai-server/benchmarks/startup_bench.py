@@ -0,0 +1,98 @@
+# Measures server startup cost: how long importing each module takes in a fresh interpreter,
+# which imports dominate it, and (optionally) how long the lazily loaded models take.
+#
+#   python benchmarks/startup_bench.py [--modules main chains.scoring_chain] [--top 15] [--load-models]
+#                                      [--max-seconds 3.0]
+#
+# Run it before and after dependency changes; --max-seconds makes it exit non-zero when importing
+# `main` gets slower than the budget, so it can guard startup time in CI.
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def parse_importtime(stderr: str) -> list:
+    # Lines look like: "import time:   self [us] | cumulative | imported package"
+    # Returns (package, nesting depth, cumulative microseconds)
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        try:
+            _, cumulative_us, name = line.split("|", 2)
+            depth = (len(name) - len(name.lstrip()) - 1) // 2
+            rows.append((name.strip(), depth, int(cumulative_us)))
+        except ValueError:
+            continue
+    return rows
+
+def _run_importtime(code: str):
+    env = {**os.environ, "MODEL_WARMUP": "false"}
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], cwd=ROOT, env=env, capture_output=True, text=True
+    )
+
+def measure_import(module: str, baseline: set) -> dict:
+    result = _run_importtime(f"import time; started = time.perf_counter(); import {module}; print(time.perf_counter() - started)")
+    if result.returncode != 0:
+        return {"module": module, "error": result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "failed"}
+    # The module's direct imports (depth 1) and sibling packages, minus what the interpreter loads anyway,
+    # so numbers are not double counted through their submodules
+    heaviest = {}
+    for name, depth, cumulative in parse_importtime(result.stderr):
+        if depth <= 1 and name != module and name not in baseline:
+            heaviest[name] = max(heaviest.get(name, 0), cumulative)
+    return {
+        "module": module,
+        "seconds": round(float(result.stdout.strip().splitlines()[-1]), 3),
+        "heaviest": sorted(heaviest.items(), key=lambda item: item[1], reverse=True)
+    }
+
+def measure_models() -> dict:
+    code = (
+        "import json, time\n"
+        "from chains.scoring_chain import get_sbert_model, encode_texts\n"
+        "started = time.perf_counter(); get_sbert_model(); loaded = time.perf_counter() - started\n"
+        "started = time.perf_counter(); encode_texts(['warm-up']); first = time.perf_counter() - started\n"
+        "print(json.dumps({'sbert_load_seconds': round(loaded, 3), 'first_encode_seconds': round(first, 3)}))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        return {"error": result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "failed"}
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--modules", nargs="+", default=["main", "chains.scoring_chain", "ai_agents.hr_agent"])
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--load-models", action="store_true")
+    parser.add_argument("--max-seconds", type=float, default=None, help="fail if importing main takes longer")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    baseline = {name for name, _, _ in parse_importtime(_run_importtime("pass").stderr)}
+    exit_code = 0
+    for module in args.modules:
+        report = measure_import(module, baseline)
+        if "error" in report:
+            print(f"{module:<24} failed: {report['error']}")
+            exit_code = 1
+            continue
+        print(f"{module:<24} {report['seconds']:>7.3f}s")
+        for name, cumulative_us in report["heaviest"][:args.top]:
+            print(f"    {name:<32} {cumulative_us / 1e6:>7.3f}s")
+        if module == "main" and args.max_seconds is not None and report["seconds"] > args.max_seconds:
+            print(f"importing main took {report['seconds']:.3f}s, budget is {args.max_seconds:.3f}s")
+            exit_code = 1
+
+    if args.load_models:
+        print(f"models                   {json.dumps(measure_models())}")
+    print(f"benchmark finished in {time.perf_counter() - started:.1f}s")
+    return exit_code
+
+if __name__ == "__main__":
+    sys.exit(main())
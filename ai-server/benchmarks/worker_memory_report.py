@@ -0,0 +1,154 @@
+# Reports per-worker memory of a multi-worker server from /proc/<pid>/smaps_rollup (Linux only).
+#
+#   python benchmarks/worker_memory_report.py --pid <master pid>
+#   python benchmarks/worker_memory_report.py --launch uvicorn gunicorn [--workers 8] [--timeout 180]
+#
+# RSS counts shared pages once per process, so summing it overstates the real footprint; PSS splits
+# each shared page between the processes mapping it, so the PSS total is what the box actually pays.
+# --launch starts the server in each deployment mode (`uvicorn --workers N`, which loads the model in
+# every worker, and gunicorn with gunicorn.conf.py, which shares it), waits until memory settles and
+# prints one report per mode. The server needs its usual environment (MONGODB_URI, model cache).
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIELDS = ["Rss", "Pss", "Shared_Clean", "Shared_Dirty", "Private_Clean", "Private_Dirty", "Swap"]
+# Processes spawned alongside the workers that are not workers themselves
+HELPER_MARKERS = ("resource_tracker", "forkserver", "semaphore_tracker")
+
+LAUNCH_COMMANDS = {
+    "uvicorn": lambda workers, port: [sys.executable, "-m", "uvicorn", "main:app", "--workers", str(workers), "--port", str(port)],
+    "gunicorn": lambda workers, port: [sys.executable, "-m", "gunicorn", "main:app", "-c", "gunicorn.conf.py", "--workers", str(workers), "--bind", f"127.0.0.1:{port}"]
+}
+
+def read_memory(pid: int) -> dict:
+    # Values in kB; falls back to summing smaps on kernels without smaps_rollup
+    memory = dict.fromkeys(FIELDS, 0)
+    for name in ("smaps_rollup", "smaps"):
+        try:
+            with open(f"/proc/{pid}/{name}") as f:
+                for line in f:
+                    key, _, rest = line.partition(":")
+                    if key in memory:
+                        memory[key] += int(rest.split()[0])
+            return memory
+        except FileNotFoundError:
+            continue
+    return memory
+
+def read_cmdline(pid: int) -> str:
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            return f.read().replace(b"\0", b" ").decode(errors="replace").strip()
+    except OSError:
+        return ""
+
+def process_tree(root: int) -> list:
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # The command name may contain spaces; fields after the closing paren are fixed
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+    pids, pending = [], [root]
+    while pending:
+        pid = pending.pop()
+        pids.append(pid)
+        pending.extend(sorted(children.get(pid, [])))
+    return pids
+
+def collect(root: int) -> list:
+    rows = []
+    for pid in process_tree(root):
+        if pid == os.getpid():
+            continue
+        cmdline = read_cmdline(pid)
+        if pid == root:
+            role = "master"
+        elif any(marker in cmdline for marker in HELPER_MARKERS):
+            role = "helper"
+        else:
+            role = "worker"
+        rows.append({"pid": pid, "role": role, "cmdline": cmdline, **read_memory(pid)})
+    return rows
+
+def print_report(title: str, rows: list):
+    mb = lambda kb: kb / 1024
+    print(title)
+    print(f"  {'pid':>7} {'role':<7} {'RSS MB':>9} {'PSS MB':>9} {'shared MB':>10} {'private MB':>11}")
+    for row in rows:
+        shared = row["Shared_Clean"] + row["Shared_Dirty"]
+        private = row["Private_Clean"] + row["Private_Dirty"]
+        print(f"  {row['pid']:>7} {row['role']:<7} {mb(row['Rss']):>9.1f} {mb(row['Pss']):>9.1f} {mb(shared):>10.1f} {mb(private):>11.1f}")
+    workers = [row for row in rows if row["role"] == "worker"]
+    total_rss = sum(row["Rss"] for row in rows)
+    total_pss = sum(row["Pss"] for row in rows)
+    print(f"  total: RSS {mb(total_rss):.1f} MB (overcounts shared pages), PSS {mb(total_pss):.1f} MB")
+    if workers:
+        print(
+            f"  per worker ({len(workers)}): PSS {mb(sum(r['Pss'] for r in workers) / len(workers)):.1f} MB, "
+            f"private {mb(sum(r['Private_Clean'] + r['Private_Dirty'] for r in workers) / len(workers)):.1f} MB"
+        )
+
+def wait_until_settled(root: int, workers: int, timeout: float, interval: float = 2.0) -> list:
+    # Settled = all workers are up and total PSS moved less than 1% over the last three samples
+    deadline = time.monotonic() + timeout
+    history = []
+    rows = collect(root)
+    while time.monotonic() < deadline:
+        time.sleep(interval)
+        rows = collect(root)
+        if sum(1 for row in rows if row["role"] == "worker") < workers:
+            continue
+        history = (history + [sum(row["Pss"] for row in rows)])[-3:]
+        if len(history) == 3 and max(history) - min(history) <= 0.01 * max(history):
+            return rows
+    print(f"  memory did not settle within {timeout:.0f}s; reporting the last sample")
+    return rows
+
+def launch(mode: str, workers: int, port: int, timeout: float) -> list:
+    env = {**os.environ, "WEB_CONCURRENCY": str(workers)}
+    server = subprocess.Popen(
+        LAUNCH_COMMANDS[mode](workers, port), cwd=ROOT, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True
+    )
+    try:
+        return wait_until_settled(server.pid, workers, timeout)
+    finally:
+        os.killpg(server.pid, signal.SIGTERM)
+        try:
+            server.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            os.killpg(server.pid, signal.SIGKILL)
+
+def main():
+    parser = argparse.ArgumentParser()
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--pid", type=int, help="report an already running server by its master pid")
+    target.add_argument("--launch", nargs="+", choices=sorted(LAUNCH_COMMANDS), help="start and measure these modes")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timeout", type=float, default=180, help="seconds to wait for memory to settle")
+    args = parser.parse_args()
+
+    if not os.path.exists("/proc/self/smaps_rollup") and not os.path.exists("/proc/self/smaps"):
+        print("needs Linux /proc/<pid>/smaps")
+        return 1
+    if args.pid:
+        print_report(f"pid {args.pid}", collect(args.pid))
+        return 0
+    for mode in args.launch:
+        print_report(f"{mode}, {args.workers} workers", launch(mode, args.workers, args.port, args.timeout))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
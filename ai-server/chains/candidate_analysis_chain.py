@@ -0,0 +1,65 @@
+from langchain.prompts import ChatPromptTemplate
+
+from services.llm_client import llm_clients
+from chains.llm_runner import run_chain, extract_json_object
+
+METRIC_KEYS = ["technical_skills", "communication", "problem_solving", "team_collaboration"]
+
+analysis_prompt = ChatPromptTemplate.from_template("""
+You are an expert HR reviewer. Given the job description and the candidate's resume, return a single JSON object with exactly these keys:
+- "persona": the candidate's professional persona in one concise sentence, focusing on their strengths, work style, and fit for the role (string).
+- "interview_tasks": a list of 3 concise, technical interview tasks that directly assess the candidate's fit for this role. Each task should be clear and actionable (list of strings).
+- "review": a unique, detailed, and professional performance review (string, 5-8 sentences).
+- "metrics": an object with numeric scores (0-100) for "technical_skills", "communication", "problem_solving", and "team_collaboration".
+Only return valid JSON.
+
+Job Title: {title}
+Job Description: {description}
+Requirements: {requirements}
+
+Candidate Resume:
+{resume}
+""")
+
+def _analysis_chain(llm=None):
+    return analysis_prompt | (llm or llm_clients.chat_model("candidate_analysis"))
+
+def _valid_text(value) -> bool:
+    return isinstance(value, str) and bool(value.strip())
+
+def _valid_tasks(value) -> bool:
+    return isinstance(value, list) and bool(value) and all(_valid_text(task) for task in value)
+
+def _valid_metrics(value) -> bool:
+    if not isinstance(value, dict):
+        return False
+    for key in METRIC_KEYS:
+        metric = value.get(key)
+        if isinstance(metric, bool) or not isinstance(metric, (int, float)) or not 0 <= metric <= 100:
+            return False
+    return True
+
+def validate_candidate_analysis(parsed) -> dict:
+    # Returns only the fields that passed validation; missing keys are regenerated by the caller
+    if not isinstance(parsed, dict):
+        return {}
+    valid = {}
+    if _valid_text(parsed.get("persona")):
+        valid["persona"] = parsed["persona"].strip()
+    if _valid_tasks(parsed.get("interview_tasks")):
+        valid["interview_tasks"] = [task.strip() for task in parsed["interview_tasks"]]
+    if _valid_text(parsed.get("review")):
+        valid["performance_review"] = parsed["review"].strip()
+    if _valid_metrics(parsed.get("metrics")):
+        valid["performance_metrics"] = {key: parsed["metrics"][key] for key in METRIC_KEYS}
+    return valid
+
+async def analyze_candidate_with_langchain(resume_text: str, job: dict, use_cache: bool = True, llm=None) -> dict:
+    result = await run_chain(_analysis_chain(llm), {
+        "title": job.get('title', ''),
+        "description": job.get('description', ''),
+        "requirements": ', '.join(job.get('requirements', [])),
+        "resume": resume_text
+    }, max_output_tokens=2048, use_cache=use_cache)
+    content = result.content if hasattr(result, "content") else str(result)
+    return validate_candidate_analysis(extract_json_object(content))
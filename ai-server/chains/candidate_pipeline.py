@@ -0,0 +1,60 @@
+import asyncio
+import logging
+import os
+
+from chains.persona_chain import detect_persona_with_langchain
+from chains.performance_chain import generate_performance_review_with_langchain
+from chains.interview_chain import generate_interview_tasks_with_langchain
+from chains.candidate_analysis_chain import analyze_candidate_with_langchain
+from services.llm_client import LLMClientFactory
+
+logger = logging.getLogger(__name__)
+
+# "fused" asks for persona, tasks, review and metrics in one request; "separate" uses one chain per field
+CANDIDATE_ANALYSIS_MODE = os.getenv("CANDIDATE_ANALYSIS_MODE", "fused")
+
+async def _performance_review(resume_text: str, job: dict, clients: LLMClientFactory) -> dict:
+    performance_review = await generate_performance_review_with_langchain(
+        resume_text, job, llm=clients.chat_model("performance")
+    )
+    if not isinstance(performance_review, dict):
+        performance_review = {"review": str(performance_review), "metrics": {}}
+    return {
+        "performance_review": performance_review.get("review", ""),
+        "performance_metrics": performance_review.get("metrics", {}) or {}
+    }
+
+async def _persona(resume_text: str, job: dict, clients: LLMClientFactory) -> dict:
+    return {"persona": await detect_persona_with_langchain(resume_text, job, llm=clients.chat_model("persona"))}
+
+async def _interview_tasks(resume_text: str, job: dict, clients: LLMClientFactory) -> dict:
+    return {"interview_tasks": await generate_interview_tasks_with_langchain(
+        resume_text, job, llm=clients.chat_model("interview")
+    )}
+
+async def analyze_candidate_with_chains(resume_text: str, job: dict, clients: LLMClientFactory) -> dict:
+    # Each step is already known, so call the chains directly instead of letting the agent pick tools.
+    # They run concurrently; the shared rate limiter decides how many actually hit the provider at once.
+    analysis = {}
+    if CANDIDATE_ANALYSIS_MODE == "fused":
+        try:
+            analysis = await analyze_candidate_with_langchain(
+                resume_text, job, llm=clients.chat_model("candidate_analysis")
+            )
+        except Exception as e:
+            logger.warning(f"Fused candidate analysis failed, falling back to per-field chains: {e}")
+
+    fallbacks = []
+    if "persona" not in analysis:
+        fallbacks.append(_persona(resume_text, job, clients))
+    if "interview_tasks" not in analysis:
+        fallbacks.append(_interview_tasks(resume_text, job, clients))
+    if "performance_review" not in analysis or "performance_metrics" not in analysis:
+        fallbacks.append(_performance_review(resume_text, job, clients))
+    if fallbacks and CANDIDATE_ANALYSIS_MODE == "fused":
+        logger.info(f"Regenerating {len(fallbacks)} field(s) that failed fused validation")
+
+    for fields in await asyncio.gather(*fallbacks):
+        for key, value in fields.items():
+            analysis.setdefault(key, value)
+    return analysis
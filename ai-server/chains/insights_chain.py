@@ -0,0 +1,32 @@
+import json
+from langchain.prompts import ChatPromptTemplate
+
+from services.llm_client import llm_clients
+from chains.llm_runner import run_chain, stream_chain
+
+insights_prompt = ChatPromptTemplate.from_template("""
+Given the following job description and candidate data, generate a concise, professional insight summary (4-6 sentences) for a hiring manager. Highlight strengths, weaknesses, and trends in the candidate pool, and suggest actionable recommendations.
+
+Job Title: {title}
+Job Requirements: {requirements}
+
+Candidates:
+{candidates}
+""")
+
+def _insights_chain(llm=None):
+    return insights_prompt | (llm or llm_clients.chat_model("insights"))
+
+def _insights_inputs(job: dict, candidates: list) -> dict:
+    return {
+        "title": job.get('title', ''),
+        "requirements": ', '.join(job.get('requirements', [])),
+        "candidates": json.dumps(candidates, indent=2)
+    }
+
+async def generate_insights_with_langchain(job: dict, candidates: list, use_cache: bool = True, llm=None) -> str:
+    result = await run_chain(_insights_chain(llm), _insights_inputs(job, candidates), use_cache=use_cache)
+    return result.content.strip() if hasattr(result, "content") else str(result).strip()
+
+def stream_insights_with_langchain(job: dict, candidates: list, use_cache: bool = True, llm=None):
+    return stream_chain(_insights_chain(llm), _insights_inputs(job, candidates), use_cache=use_cache)
@@ -1,18 +1,8 @@
-import os
 import re
-from dotenv import load_dotenv
 from langchain.prompts import ChatPromptTemplate
-from langchain_openai import ChatOpenAI
 
-load_dotenv()
-GROQ_API_KEY = os.getenv("GROQ_API_KEY")
-GROQ_MODEL =  "llama3-8b-8192"
-
-llm = ChatOpenAI(
-    api_key=GROQ_API_KEY,
-    base_url="https://api.groq.com/openai/v1",
-    model=GROQ_MODEL
-)
+from services.llm_client import llm_clients
+from chains.llm_runner import run_chain
 
 interview_prompt = ChatPromptTemplate.from_template("""
 Given the following job description and candidate resume, generate a numbered list of 3 concise, technical interview tasks that directly assess the candidate's fit for this role. Each task should be clear and actionable.
@@ -25,15 +15,16 @@ Candidate Resume:
 {resume}
 """)
 
-interview_chain = interview_prompt | llm
+def _interview_chain(llm=None):
+    return interview_prompt | (llm or llm_clients.chat_model("interview"))
 
-async def generate_interview_tasks_with_langchain(resume_text: str, job: dict) -> list:
-    result = await interview_chain.ainvoke({
+async def generate_interview_tasks_with_langchain(resume_text: str, job: dict, use_cache: bool = True, llm=None) -> list:
+    result = await run_chain(_interview_chain(llm), {
         "title": job.get('title', ''),
         "description": job.get('description', ''),
         "requirements": ', '.join(job.get('requirements', [])),
         "resume": resume_text
-    })
+    }, use_cache=use_cache)
     content = result.content if hasattr(result, "content") else str(result)
     tasks = re.findall(r"\d+\.\s*(.+)", content)
     if not tasks:
@@ -0,0 +1,76 @@
+import json
+import re
+from typing import AsyncIterator, Optional
+from langchain_core.messages import AIMessage
+
+from services.rate_limiter import llm_limiter, estimate_tokens
+from services.llm_cache import llm_cache, cache_key
+
+# Upper bound on completion size, charged against the tokens-per-minute budget up front
+DEFAULT_MAX_OUTPUT_TOKENS = 1024
+
+def _actual_tokens(result) -> Optional[int]:
+    usage = getattr(result, "usage_metadata", None) or {}
+    if usage.get("total_tokens"):
+        return usage["total_tokens"]
+    token_usage = (getattr(result, "response_metadata", None) or {}).get("token_usage") or {}
+    return token_usage.get("total_tokens")
+
+def _chain_cache_key(chain, inputs: dict) -> str:
+    # chain is `prompt | llm`: key on the model, the fully rendered prompt and the generation parameters
+    prompt, llm = chain.first, chain.last
+    params = {name: getattr(llm, name, None) for name in ("temperature", "max_tokens", "top_p", "model_kwargs")}
+    return cache_key(getattr(llm, "model_name", ""), prompt.invoke(inputs).to_string(), params)
+
+async def run_chain(chain, inputs: dict, max_output_tokens: int = DEFAULT_MAX_OUTPUT_TOKENS, use_cache: bool = True):
+    key = _chain_cache_key(chain, inputs)
+    if use_cache:
+        cached = await llm_cache.get(key)
+        if cached is not None:
+            return AIMessage(content=cached)
+
+    # Every chain invocation goes through the shared limiter so we use the provider quota, not a fixed sleep
+    estimated = estimate_tokens("".join(str(v) for v in inputs.values())) + max_output_tokens
+    result = await llm_limiter.run(lambda: chain.ainvoke(inputs), estimated_tokens=estimated)
+    llm_limiter.record_usage(estimated, _actual_tokens(result))
+
+    # Fresh results still refresh the cache so later callers benefit from them
+    content = result.content if hasattr(result, "content") else str(result)
+    await llm_cache.set(key, content)
+    return result
+
+async def stream_chain(chain, inputs: dict, max_output_tokens: int = DEFAULT_MAX_OUTPUT_TOKENS, use_cache: bool = True) -> AsyncIterator[str]:
+    # Same cache and limiter as run_chain, but yields text as the model produces it
+    key = _chain_cache_key(chain, inputs)
+    if use_cache:
+        cached = await llm_cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+
+    estimated = estimate_tokens("".join(str(v) for v in inputs.values())) + max_output_tokens
+    aggregate = None
+    async for chunk in llm_limiter.stream(lambda: chain.astream(inputs), estimated_tokens=estimated):
+        aggregate = chunk if aggregate is None else aggregate + chunk
+        text = chunk.content if hasattr(chunk, "content") else str(chunk)
+        if text:
+            yield text
+    if aggregate is None:
+        return
+    llm_limiter.record_usage(estimated, _actual_tokens(aggregate))
+    # Only a completed stream is cached; an abandoned one never reaches this point
+    await llm_cache.set(key, aggregate.content if hasattr(aggregate, "content") else str(aggregate))
+
+def extract_json_object(content: str) -> Optional[dict]:
+    try:
+        return json.loads(content)
+    except Exception:
+        match = re.search(r"```(?:json)?\s*({[\s\S]+?})\s*```", content)
+        if not match:
+            match = re.search(r"({[\s\S]+})", content)
+        if match:
+            try:
+                return json.loads(match.group(1))
+            except Exception:
+                pass
+        return None
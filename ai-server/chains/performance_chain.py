@@ -1,19 +1,7 @@
-import os
-import json
-import re
-from dotenv import load_dotenv
 from langchain.prompts import ChatPromptTemplate
-from langchain_openai import ChatOpenAI
 
-load_dotenv()
-GROQ_API_KEY = os.getenv("GROQ_API_KEY")
-GROQ_MODEL = "llama3-8b-8192"
-
-llm = ChatOpenAI(
-    api_key=GROQ_API_KEY,
-    base_url="https://api.groq.com/openai/v1",
-    model=GROQ_MODEL
-)
+from services.llm_client import llm_clients
+from chains.llm_runner import run_chain, stream_chain, extract_json_object
 
 performance_prompt = ChatPromptTemplate.from_template("""
 You are an expert HR reviewer. Given the job description and the candidate's resume, generate a JSON object with:
@@ -29,25 +17,27 @@ Candidate Resume:
 {resume}
 """)
 
-performance_chain = performance_prompt | llm
+def _performance_chain(llm=None):
+    return performance_prompt | (llm or llm_clients.chat_model("performance"))
 
-async def generate_performance_review_with_langchain(resume_text: str, job: dict) -> dict:
-    result = await performance_chain.ainvoke({
+def _performance_inputs(resume_text: str, job: dict) -> dict:
+    return {
         "title": job.get('title', ''),
         "description": job.get('description', ''),
         "requirements": ', '.join(job.get('requirements', [])),
         "resume": resume_text
-    })
-    content = result.content if hasattr(result, "content") else str(result)
-    try:
-        return json.loads(content)
-    except Exception:
-        match = re.search(r"```(?:json)?\s*({[\s\S]+?})\s*```", content)
-        if not match:
-            match = re.search(r"({[\s\S]+})", content)
-        if match:
-            try:
-                return json.loads(match.group(1))
-            except Exception:
-                pass
-        return {"review": content, "metrics": {}}
\ No newline at end of file
+    }
+
+def parse_performance_review(content: str) -> dict:
+    parsed = extract_json_object(content)
+    if parsed is None:
+        return {"review": content, "metrics": {}}
+    return parsed
+
+async def generate_performance_review_with_langchain(resume_text: str, job: dict, use_cache: bool = True, llm=None) -> dict:
+    result = await run_chain(_performance_chain(llm), _performance_inputs(resume_text, job), use_cache=use_cache)
+    return parse_performance_review(result.content if hasattr(result, "content") else str(result))
+
+def stream_performance_review_with_langchain(resume_text: str, job: dict, use_cache: bool = True, llm=None):
+    # Yields the raw JSON text; callers parse the assembled text with parse_performance_review
+    return stream_chain(_performance_chain(llm), _performance_inputs(resume_text, job), use_cache=use_cache)
\ No newline at end of file
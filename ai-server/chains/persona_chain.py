@@ -1,17 +1,7 @@
-import os
-from dotenv import load_dotenv
 from langchain.prompts import ChatPromptTemplate
-from langchain_openai import ChatOpenAI
 
-load_dotenv()
-GROQ_API_KEY = os.getenv("GROQ_API_KEY")
-GROQ_MODEL = "llama3-8b-8192"
-
-llm = ChatOpenAI(
-    api_key=GROQ_API_KEY,
-    base_url="https://api.groq.com/openai/v1",
-    model=GROQ_MODEL
-)
+from services.llm_client import llm_clients
+from chains.llm_runner import run_chain, stream_chain
 
 persona_prompt = ChatPromptTemplate.from_template("""
 Analyze the following candidate's resume and the job context. Summarize the candidate's professional persona in one concise sentence, focusing on their strengths, work style, and fit for the role.
@@ -24,16 +14,21 @@ Candidate Resume:
 {resume}
 """)
 
-persona_chain = persona_prompt | llm
-
-
+def _persona_chain(llm=None):
+    return persona_prompt | (llm or llm_clients.chat_model("persona"))
 
-async def detect_persona_with_langchain(resume_text: str, job: dict) -> str:
-    result = await persona_chain.ainvoke({
+def _persona_inputs(resume_text: str, job: dict) -> dict:
+    return {
         "title": job.get('title', ''),
         "description": job.get('description', ''),
         "requirements": ', '.join(job.get('requirements', [])),
         "resume": resume_text
-    })
+    }
+
+async def detect_persona_with_langchain(resume_text: str, job: dict, use_cache: bool = True, llm=None) -> str:
+    result = await run_chain(_persona_chain(llm), _persona_inputs(resume_text, job), use_cache=use_cache)
     return result.content.strip() if hasattr(result, "content") else str(result).strip()
 
+def stream_persona_with_langchain(resume_text: str, job: dict, use_cache: bool = True, llm=None):
+    return stream_chain(_persona_chain(llm), _persona_inputs(resume_text, job), use_cache=use_cache)
+
@@ -1,26 +1,130 @@
-from sentence_transformers import SentenceTransformer, util
+import logging
+import os
+import threading
+from typing import List, Optional
+import numpy as np
 from fastapi import HTTPException
 
-# You may want to load this model only once and share it
-sbert_model = SentenceTransformer('all-MiniLM-L6-v2')
+logger = logging.getLogger(__name__)
 
-async def score_resume_with_sbert(resume_text: str, job_requirements: list) -> float:
+SBERT_MODEL_NAME = os.getenv("SBERT_MODEL_NAME", "all-MiniLM-L6-v2")
+# "torch" (fp32), "onnx" (fp32 through ONNX Runtime) or "onnx-int8" (dynamically quantized ONNX)
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+# Instruction set the int8 model is quantized for: arm64, avx2, avx512 or avx512_vnni
+ONNX_QUANTIZATION = os.getenv("ONNX_QUANTIZATION", "avx2")
+ONNX_MODEL_DIR = os.getenv("ONNX_MODEL_DIR", os.path.join("models", "onnx"))
+ENCODE_BATCH_SIZE = 64
+
+# Quantized files published alongside the model on the Hugging Face hub
+_QUANTIZED_FILES = {
+    "arm64": "onnx/model_qint8_arm64.onnx",
+    "avx2": "onnx/model_quint8_avx2.onnx",
+    "avx512": "onnx/model_qint8_avx512.onnx",
+    "avx512_vnni": "onnx/model_qint8_avx512_vnni.onnx"
+}
+
+_sbert_model = None
+_sbert_backend = None
+_sbert_lock = threading.Lock()
+
+def _load_onnx_int8(model_name: str):
+    from sentence_transformers import SentenceTransformer
+
+    file_name = _QUANTIZED_FILES[ONNX_QUANTIZATION]
     try:
-        resume_embedding = sbert_model.encode(resume_text, convert_to_tensor=True)
-        scores = []
-        for req in job_requirements:
-            req_embedding = sbert_model.encode(req, convert_to_tensor=True)
-            similarity = util.pytorch_cos_sim(resume_embedding, req_embedding).item()
-            scores.append(similarity)
-        semantic_score = sum(scores) / len(scores) * 100 if scores else 0.0
+        return SentenceTransformer(model_name, backend="onnx", model_kwargs={"file_name": file_name})
+    except Exception as e:
+        logger.info(f"No published {file_name} for {model_name} ({e}); quantizing locally")
+
+    # Export to ONNX and quantize once; later starts load the saved file
+    from sentence_transformers import export_dynamic_quantized_onnx_model
+
+    local_dir = os.path.join(ONNX_MODEL_DIR, model_name.replace("/", "__"))
+    local_file = f"onnx/model_qint8_{ONNX_QUANTIZATION}.onnx"
+    if not os.path.exists(os.path.join(local_dir, local_file)):
+        model = SentenceTransformer(model_name, backend="onnx")
+        model.save(local_dir)
+        export_dynamic_quantized_onnx_model(model, ONNX_QUANTIZATION, local_dir, file_suffix=f"qint8_{ONNX_QUANTIZATION}")
+    return SentenceTransformer(local_dir, backend="onnx", model_kwargs={"file_name": local_file})
+
+def load_embedding_model(backend: str = EMBEDDING_BACKEND, model_name: str = SBERT_MODEL_NAME):
+    from sentence_transformers import SentenceTransformer
+
+    if backend == "onnx-int8":
+        return _load_onnx_int8(model_name)
+    if backend == "onnx":
+        return SentenceTransformer(model_name, backend="onnx")
+    return SentenceTransformer(model_name)
+
+def get_sbert_model():
+    # Loaded on first use (or by the startup warm-up) so importing this module does not pull in torch
+    global _sbert_model, _sbert_backend
+    if _sbert_model is None:
+        with _sbert_lock:
+            if _sbert_model is None:
+                # No fallback to torch: stored embeddings are tagged with EMBEDDING_BACKEND (embedding_model_id),
+                # so torch vectors written under an ONNX tag would later be mixed with real ONNX ones
+                try:
+                    _sbert_model, _sbert_backend = load_embedding_model(EMBEDDING_BACKEND), EMBEDDING_BACKEND
+                except Exception as e:
+                    logger.error(f"Embedding backend {EMBEDDING_BACKEND} failed to load: {e}")
+                    raise
+    return _sbert_model
 
+def embedding_model_id() -> str:
+    # Names the vector space of stored embeddings, so vectors from another model or backend are never mixed in
+    return f"{SBERT_MODEL_NAME}:{EMBEDDING_BACKEND}"
+
+def embedding_backend() -> Optional[str]:
+    return _sbert_backend
+
+def sbert_model_loaded() -> bool:
+    return _sbert_model is not None
+
+def encode_texts(texts: List[str]) -> np.ndarray:
+    # One batched forward pass; rows are L2-normalised so a dot product is the cosine similarity
+    return get_sbert_model().encode(
+        texts,
+        batch_size=ENCODE_BATCH_SIZE,
+        convert_to_numpy=True,
+        normalize_embeddings=True
+    )
+
+def score_embeddings(resume_texts: List[str], resume_embeddings: np.ndarray, job_requirements: list, requirement_embeddings: np.ndarray) -> List[float]:
+    if not job_requirements:
+        return [0.0 for _ in resume_texts]
+    # (n_resumes, n_requirements) similarity matrix in a single matmul
+    similarity = np.asarray(resume_embeddings, dtype=np.float32) @ np.asarray(requirement_embeddings, dtype=np.float32).T
+    semantic_scores = similarity.mean(axis=1) * 100
+
+    requirements_lower = [req.lower() for req in job_requirements]
+    scores = []
+    for resume_text, semantic_score in zip(resume_texts, semantic_scores):
         # Keyword match boost
         resume_lower = resume_text.lower()
-        keyword_matches = sum(1 for req in job_requirements if req.lower() in resume_lower)
-        keyword_score = (keyword_matches / len(job_requirements)) * 100 if job_requirements else 0
+        keyword_matches = sum(1 for req in requirements_lower if req in resume_lower)
+        keyword_score = (keyword_matches / len(requirements_lower)) * 100
 
         # Final blended score
-        final_score = round(0.7 * semantic_score + 0.3 * keyword_score, 2)
-        return final_score
+        scores.append(round(0.7 * float(semantic_score) + 0.3 * keyword_score, 2))
+    return scores
+
+async def score_resumes_with_sbert(resume_texts: List[str], job_requirements: list, requirement_embeddings: Optional[np.ndarray] = None, resume_embeddings: Optional[np.ndarray] = None) -> List[float]:
+    try:
+        if not resume_texts:
+            return []
+        # Imported here: the batcher module itself builds on encode_texts
+        from services.embedding_batcher import embedding_batcher
+
+        if resume_embeddings is None:
+            resume_embeddings = await embedding_batcher.embed(resume_texts)
+        if requirement_embeddings is None and job_requirements:
+            requirement_embeddings = await embedding_batcher.embed(job_requirements)
+        return score_embeddings(resume_texts, resume_embeddings, job_requirements, requirement_embeddings)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Resume scoring failed: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Resume scoring failed: {str(e)}")
+
+async def score_resume_with_sbert(resume_text: str, job_requirements: list, requirement_embeddings: Optional[np.ndarray] = None, resume_embedding: Optional[np.ndarray] = None) -> float:
+    resume_embeddings = None if resume_embedding is None else np.asarray(resume_embedding).reshape(1, -1)
+    scores = await score_resumes_with_sbert([resume_text], job_requirements, requirement_embeddings, resume_embeddings)
+    return scores[0]
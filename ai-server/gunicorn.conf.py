@@ -0,0 +1,65 @@
+# Multi-worker deployment that keeps one copy of the embedding model for all workers.
+#
+#   gunicorn main:app -c gunicorn.conf.py            # WEB_CONCURRENCY=8 for eight workers
+#
+# The master loads the model weights and imports the LangChain modules before forking, so every
+# worker starts with those pages shared copy-on-write instead of loading its own copy (which is
+# what `uvicorn main:app --workers N` does). The app itself is still imported in each worker:
+# main.py opens the Mongo client at import time and that must not cross a fork.
+# Measure the result with `python benchmarks/worker_memory_report.py`.
+import gc
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", "4"))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = False
+timeout = int(os.getenv("WORKER_TIMEOUT", "120"))
+# Load the model once in the master; off, every worker loads its own copy on first use
+SHARE_MODEL_WEIGHTS = os.getenv("SHARE_MODEL_WEIGHTS", "true").lower() in ("1", "true", "yes")
+# Intra-op threads per worker; by default the cores are split between workers instead of each
+# worker's torch pool claiming all of them
+TORCH_THREADS_PER_WORKER = int(os.getenv("TORCH_THREADS_PER_WORKER", str(max(1, (os.cpu_count() or 1) // workers))))
+
+PRELOAD_MODULES = [
+    "chains.persona_chain",
+    "chains.performance_chain",
+    "chains.interview_chain",
+    "chains.insights_chain",
+    "chains.candidate_pipeline",
+    "ai_agents.hr_agent"
+]
+
+logger = logging.getLogger("gunicorn.error")
+
+def on_starting(server):
+    if not SHARE_MODEL_WEIGHTS:
+        return
+    import importlib
+    from chains import scoring_chain
+
+    for module in PRELOAD_MODULES:
+        importlib.import_module(module)
+    if scoring_chain.EMBEDDING_BACKEND != "torch":
+        # ONNX Runtime sessions own thread pools that do not survive fork; each worker loads its own
+        logger.info(f"EMBEDDING_BACKEND={scoring_chain.EMBEDDING_BACKEND}: model is loaded per worker")
+    else:
+        # Weights only: running a forward pass here would start torch's thread pool before the fork
+        scoring_chain.get_sbert_model()
+        logger.info(f"Loaded {scoring_chain.SBERT_MODEL_NAME} in the master for {workers} workers")
+    # Move everything loaded so far out of the collector's reach; collections in the workers would
+    # otherwise write to these objects' headers and un-share their pages
+    gc.collect()
+    gc.freeze()
+
+def post_fork(server, worker):
+    try:
+        import torch
+
+        torch.set_num_threads(TORCH_THREADS_PER_WORKER)
+    except ImportError:
+        pass
@@ -1,8 +1,7 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException, Depends, Body, Form, Path
+from fastapi import FastAPI, UploadFile, File, HTTPException, Depends, Body, Form, Path, Query
 from fastapi.security import OAuth2PasswordBearer
 from pydantic import BaseModel
 from typing import List, Optional
-import pdfplumber
 import logging
 import uvicorn
 import motor.motor_asyncio
@@ -11,46 +10,119 @@ from fastapi.middleware.cors import CORSMiddleware
 from uuid import uuid4
 from dotenv import load_dotenv
 from fastapi.responses import StreamingResponse
-import io
-import csv
+import shutil
 import json
 import re
 import asyncio
+import time
+from contextlib import asynccontextmanager
+import numpy as np
+from pymongo import UpdateOne
+from pymongo.errors import DuplicateKeyError
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi.encoders import jsonable_encoder
+try:
+    import orjson
+    from fastapi.responses import ORJSONResponse as FastJSONResponse
+except ImportError:
+    from fastapi.responses import JSONResponse as FastJSONResponse
+    orjson = None
 
-# At the top of your file
-LLM_REQUEST_LOCK = asyncio.Lock()
-LLM_REQUEST_DELAY = 5.5  # seconds
-
-async def safe_agent_decide(prompt):
-    async with LLM_REQUEST_LOCK:
-        result = await agent_decide(prompt)
-        await asyncio.sleep(LLM_REQUEST_DELAY)
-        return result
 os.environ["USE_TF"] = "0"
 os.environ["TRANSFORMERS_NO_TF"] = "1"
 
 # --- LangChain imports ---
-from chains.persona_chain import detect_persona_with_langchain
-from chains.performance_chain import generate_performance_review_with_langchain
+from chains.persona_chain import stream_persona_with_langchain
+from chains.performance_chain import stream_performance_review_with_langchain, parse_performance_review
+from chains.insights_chain import generate_insights_with_langchain, stream_insights_with_langchain
 from chains.interview_chain import generate_interview_tasks_with_langchain
-from chains.scoring_chain import score_resume_with_sbert
-from ai_agents.hr_agent import agent_decide
+from chains.scoring_chain import score_resume_with_sbert, encode_texts, score_embeddings, sbert_model_loaded, embedding_backend
+from chains.candidate_pipeline import analyze_candidate_with_chains
+from services.rate_limiter import llm_limiter, estimate_tokens
+from services.llm_cache import llm_cache, cache_key
+from services.llm_client import LLMClientFactory, llm_clients, get_llm_clients
+from services.embedding_cache import RequirementEmbeddingCache, REQUIREMENT_EMBEDDINGS_FIELD, EMBEDDING_MODEL_FIELD, current_resume_embedding, resume_embedding_fields
+from services.matching import MatchingEngine, vectors_updated_now
+from services.resume_queue import ResumeQueue, PermanentTaskError
+from services.bulk_ingest import spool_upload, candidate_name_from_filename
+from services.pdf_extraction import pdf_extractor
+from services.embedding_batcher import embedding_batcher
+from services.resume_store import ResumeStore
+from services.upload_store import UploadStore, UploadMissingError
+from services.db_indexes import ensure_indexes, explain_queries
+from services.reports import job_score_distribution
+from services.job_stats import JobStats, rescore_delta
+from services.export import EXPORT_FORMATS, EXPORT_PROJECTION, export_stream, require_format
+from services.near_duplicates import NearDuplicateDetector, NearDuplicateIndex, NEAR_DUPLICATE_THRESHOLD, MIN_NEAR_DUPLICATE_THRESHOLD, unpack_signature
 
 load_dotenv()
 
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 GROQ_MODEL = "llama3-8b-8192"
 MONGODB_URI = os.getenv("MONGODB_URI")
+# "direct" calls the scoring and LLM chains straight away; "agent" routes them through the ReAct agent
+RESUME_PIPELINE = os.getenv("RESUME_PIPELINE", "direct")
+UPLOAD_DIR = os.getenv("UPLOAD_DIR", "uploads")
+BULK_EXTRACT_CONCURRENCY = int(os.getenv("BULK_EXTRACT_CONCURRENCY", str(os.cpu_count() or 4)))
+BULK_EMBED_BATCH_SIZE = int(os.getenv("BULK_EMBED_BATCH_SIZE", "32"))
+# Load models in the background at startup; off, they load on first use
+MODEL_WARMUP = os.getenv("MODEL_WARMUP", "true").lower() in ("1", "true", "yes")
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 logging.basicConfig(level=logging.INFO)
 
-app = FastAPI()
+model_status = {}
+
+async def warm_up_models():
+    # Runs off the event loop so the server accepts requests (and answers /ready) while models load
+    def load(name: str, loader):
+        started = time.perf_counter()
+        try:
+            loader()
+            model_status[name] = {"loaded": True, "seconds": round(time.perf_counter() - started, 2)}
+        except Exception as e:
+            logging.error(f"Warm-up of {name} failed: {e}")
+            model_status[name] = {"loaded": False, "error": str(e)}
+
+    # Encoding one text also initialises the tokenizer and the first forward pass
+    await asyncio.to_thread(load, "sbert", lambda: encode_texts(["warm-up"]))
+    if RESUME_PIPELINE == "agent":
+        from ai_agents.hr_agent import get_agent
+
+        await asyncio.to_thread(load, "agent", get_agent)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    try:
+        await ensure_indexes(db)
+    except Exception as e:
+        logging.error(f"Failed to ensure MongoDB indexes: {e}")
+    # Load the matching index in the background so startup is not blocked on it
+    app.state.matching_index_task = asyncio.create_task(matching_engine.ensure_loaded())
+    app.state.near_duplicate_backfill_task = asyncio.create_task(near_duplicate_detector.backfill_bands())
+    app.state.job_stats_task = asyncio.create_task(job_stats.ensure_built())
+    # One pooled HTTP client for every LLM call in this process
+    llm_clients.start()
+    if MODEL_WARMUP:
+        app.state.warmup_task = asyncio.create_task(warm_up_models())
+    embedding_batcher.start()
+    resume_queue.start()
+    yield
+    await resume_queue.stop()
+    await embedding_batcher.stop()
+    pdf_extractor.shutdown()
+    await llm_clients.aclose()
+
+app = FastAPI(lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:5173"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-After"],
 )
 
 # MongoDB setup
@@ -58,6 +130,40 @@ client = motor.motor_asyncio.AsyncIOMotorClient(MONGODB_URI)
 db = client.smart_recruitment
 jobs_collection = db.jobs
 candidates_collection = db.candidates
+requirement_cache = RequirementEmbeddingCache(jobs_collection)
+matching_engine = MatchingEngine(jobs_collection, candidates_collection, requirement_cache)
+processing_collection = db.processing_jobs
+resumes_collection = db.resumes
+upload_store = UploadStore(db, UPLOAD_DIR)
+near_duplicate_detector = NearDuplicateDetector(candidates_collection)
+job_stats = JobStats(db.job_stats, candidates_collection)
+
+# Binary fields that are never sent back to the client
+CANDIDATE_BINARY_PROJECTION = {"resume_embedding": 0, "minhash": 0, "lsh_bands": 0}
+REPORT_CANDIDATE_PROJECTION = {
+    "_id": 0,
+    "candidate_id": 1,
+    "name": 1,
+    "score": 1,
+    "status": 1,
+    "persona": 1,
+    "performance_review": 1,
+    "performance_metrics": 1
+}
+
+async def safe_agent_decide(prompt, use_cache: bool = True):
+    # Imported here so the agent stack is only loaded by the code paths that use it
+    from ai_agents.hr_agent import agent_decide
+
+    key = cache_key(f"agent:{GROQ_MODEL}", prompt)
+    if use_cache:
+        cached = await llm_cache.get(key)
+        if cached is not None:
+            return cached
+    # The agent's own LLM calls and the chains its tools invoke share the limiter's budget
+    result = await llm_limiter.run(lambda: agent_decide(prompt), estimated_tokens=estimate_tokens(prompt) + 1024)
+    await llm_cache.set(key, result)
+    return result
 
 # Pydantic Models
 class Job(BaseModel):
@@ -96,44 +202,364 @@ def extract_agent_output(result, expected_type):
     return str(result)
 
 # Helper Functions
-async def extract_resume_text_from_pdf(file: UploadFile) -> str:
+async def analyze_candidate_with_agent(resume_text: str, job: dict) -> dict:
+    # Legacy path: free-text prompts through the ReAct agent (RESUME_PIPELINE=agent)
+    persona_prompt = (
+    f"Analyze the following candidate's resume and the job context. Summarize the candidate's professional persona in one concise sentence, focusing on their strengths, work style, and fit for the role.\n\n"
+    f"Job Title: {job['title']}\n"
+    f"Job Description: {job['description']}\n"
+    f"Requirements: {', '.join(job['requirements'])}\n\n"
+    f"Candidate Resume:\n{resume_text}"
+)
+    persona_result = await safe_agent_decide(persona_prompt)
+    interview_tasks_prompt = (
+    "Given the following job description and candidate resume, generate a numbered list of 3 concise, technical interview tasks that directly assess the candidate's fit for this role. Each task should be clear and actionable.\n\n"
+    f"Job Title: {job['title']}\n"
+    f"Job Description: {job['description']}\n"
+    f"Requirements: {', '.join(job['requirements'])}\n\n"
+    f"Candidate Resume:\n{resume_text}"
+)
+    interview_tasks_result = await safe_agent_decide(interview_tasks_prompt)
+    performance_review_obj = await safe_agent_decide(
+        f"""Generate a performance review and metrics for this candidate.
+Resume: {resume_text}
+Job Title: {job['title']}
+Job Description: {job['description']}
+Requirements: {', '.join(job['requirements'])}"""
+    )
+
+    persona = extract_agent_output(persona_result, str)
+    interview_tasks = extract_agent_output(interview_tasks_result, list)
+    if isinstance(performance_review_obj, dict) and "input" in performance_review_obj:
+        performance_review_obj = performance_review_obj["input"]
+    if isinstance(performance_review_obj, str):
+        try:
+            performance_review_obj = json.loads(performance_review_obj)
+        except Exception:
+            performance_review_obj = {"review": performance_review_obj, "metrics": {}}
+    return {
+        "persona": persona,
+        "interview_tasks": interview_tasks,
+        "performance_review": performance_review_obj.get("review", ""),
+        "performance_metrics": performance_review_obj.get("metrics", {})
+    }
+
+async def extract_resume_text_from_pdf(file) -> str:
+    # Accepts an UploadFile, raw bytes or a path on disk; parsing happens in the extraction process pool
+    source = await file.read() if hasattr(file, "read") else file
     try:
-        with pdfplumber.open(file.file) as pdf:
-            return "\n".join([page.extract_text() or "" for page in pdf.pages])
+        return await pdf_extractor.extract(source)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Failed to extract text from PDF: {str(e)}")
 
+def remove_files(file_paths):
+    for file_path in file_paths:
+        try:
+            os.remove(file_path)
+        except OSError:
+            pass
+
+def save_upload(source, file_path: str):
+    with open(file_path, "wb") as out:
+        shutil.copyfileobj(source, out, 1024 * 1024)
+
+async def discard_upload(payload: dict):
+    # Local copies (the accepting process's spool file, or one fetched by another worker) and the GridFS original
+    paths = [payload["file_path"]]
+    if payload.get("upload_id"):
+        paths.append(os.path.join(UPLOAD_DIR, f"{payload['upload_id']}.pdf"))
+        await upload_store.delete(payload["upload_id"])
+    await asyncio.to_thread(remove_files, paths)
+
+async def process_resume_task(task: dict) -> dict:
+    payload = task["payload"]
+    candidate_id = payload["candidate_id"]
+    job = await jobs_collection.find_one({"job_id": payload["job_id"]})
+    if not job:
+        raise ValueError(f"Job {payload['job_id']} not found")
+
+    # Reuse text and embedding persisted by an earlier attempt so retries only redo what failed
+    candidate = await candidates_collection.find_one(
+        {"candidate_id": candidate_id},
+        {"resume_text": 1, "resume_embedding": 1, EMBEDDING_MODEL_FIELD: 1, "near_duplicate_of": 1}
+    ) or {}
+    resume_embedding = current_resume_embedding(candidate)
+    if candidate.get("resume_text") and resume_embedding is not None:
+        resume_text = candidate["resume_text"]
+    else:
+        # Identical files uploaded before (for any job) reuse their extracted text and embedding
+        try:
+            # Tasks queued before uploads went to GridFS carry only a local path
+            file_path = payload["file_path"]
+            if payload.get("upload_id"):
+                file_path = await upload_store.local_path(payload["upload_id"], file_path)
+            artifacts = await resume_store.resolve(file_path)
+        except HTTPException as e:
+            # An unreadable PDF fails the same way on every attempt
+            raise PermanentTaskError(e.detail)
+        except (FileNotFoundError, UploadMissingError):
+            raise PermanentTaskError(f"Uploaded file {payload['file_path']} is missing")
+        resume_text, resume_embedding = artifacts.resume_text, artifacts.embedding
+        await candidates_collection.update_one(
+            {"candidate_id": candidate_id},
+            {"$set": {
+                "resume_text": resume_text,
+                **resume_embedding_fields(resume_embedding),
+                "resume_sha256": artifacts.file_hash,
+                **vectors_updated_now()
+            }}
+        )
+
+    if "near_duplicate_of" not in candidate:
+        # Flag reapplications with lightly edited resumes; LSH keeps this to one indexed band lookup
+        near_duplicates = await near_duplicate_detector.check_and_add(candidate_id, resume_text)
+        await candidates_collection.update_one(
+            {"candidate_id": candidate_id},
+            {"$set": {
+                "near_duplicate_of": [
+                    {"candidate_id": other_id, "similarity": similarity} for other_id, similarity in near_duplicates
+                ]
+            }}
+        )
+
+    # Scoring is local: reuse the job's cached requirement embeddings instead of routing through the agent
+    requirement_embeddings = await requirement_cache.get(job)
+    score = await score_resume_with_sbert(resume_text, job["requirements"], requirement_embeddings, resume_embedding)
+
+    if RESUME_PIPELINE == "agent":
+        analysis = await analyze_candidate_with_agent(resume_text, job)
+    else:
+        # Queue workers have no request scope to inject from; they share the process-wide factory
+        analysis = await analyze_candidate_with_chains(resume_text, job, llm_clients)
+
+    updated = await job_stats.update_candidate({"candidate_id": candidate_id}, {
+        "score": score,
+        "persona": analysis["persona"],
+        "interview_tasks": analysis["interview_tasks"],
+        "performance_review": analysis["performance_review"],
+        "performance_metrics": analysis["performance_metrics"],
+        "status": "screened",
+        "processing_error": None
+    })
+    # The candidate may have been deleted while the task was running
+    if updated is not None:
+        matching_engine.add_candidate(candidate_id, resume_embedding)
+    await discard_upload(payload)
+    return {"candidate_id": candidate_id, "score": score}
+
+async def fail_resume_task(task: dict, error: Exception):
+    await job_stats.update_candidate(
+        {"candidate_id": task["payload"]["candidate_id"]},
+        {"status": "failed", "processing_error": str(error)}
+    )
+    # No attempt is left to need the upload
+    await discard_upload(task["payload"])
+
+def build_projection(fields: Optional[str], default: dict, hidden: set) -> dict:
+    if not fields:
+        return default
+    requested = [f.strip() for f in fields.split(",") if f.strip() and f.strip() not in hidden]
+    return {f: 1 for f in requested} if requested else default
+
+async def paginated_response(collection, query: dict, projection: dict, after: Optional[str], limit: int):
+    # Keyset pagination on _id: each page is an index range scan, however deep the client pages
+    if after:
+        try:
+            query = {**query, "_id": {"$gt": ObjectId(after)}}
+        except InvalidId:
+            raise HTTPException(status_code=400, detail="Invalid 'after' cursor")
+    docs = await collection.find(query, projection).sort("_id", 1).limit(limit).to_list(length=limit)
+    for doc in docs:
+        doc["_id"] = str(doc["_id"])
+    headers = {}
+    if len(docs) == limit:
+        # The body stays a plain list; the cursor for the next page travels in a header
+        headers["X-Next-After"] = docs[-1]["_id"]
+    # Plain JSONResponse cannot serialize datetimes (vectors_updated_at); orjson handles them natively
+    return FastJSONResponse(content=docs if orjson else jsonable_encoder(docs), headers=headers)
+
+async def rescore_job_candidates(job: dict, requirement_embeddings) -> int:
+    # Rescore every candidate of a job from stored resume embeddings: one matmul, one bulk_write, no LLM calls
+    docs = []
+    async for c in candidates_collection.find(
+        {"job_id": job["job_id"], "resume_text": {"$nin": [None, ""]}},
+        {"candidate_id": 1, "resume_text": 1, "resume_embedding": 1, EMBEDDING_MODEL_FIELD: 1, "score": 1}
+    ):
+        docs.append(c)
+    if not docs:
+        return 0
+
+    # Backfill embeddings that are missing or came from a different embedding model
+    stored = [current_resume_embedding(c) for c in docs]
+    missing = [i for i, embedding in enumerate(stored) if embedding is None]
+    backfilled = {}
+    if missing:
+        new_embeddings = await embedding_batcher.embed([docs[i]["resume_text"] for i in missing])
+        backfilled = dict(zip(missing, new_embeddings))
+
+    resume_embeddings = np.vstack([
+        backfilled[i] if i in backfilled else stored[i]
+        for i in range(len(docs))
+    ])
+    scores = score_embeddings(
+        [c["resume_text"] for c in docs], resume_embeddings, job.get("requirements", []), requirement_embeddings
+    )
+
+    operations = []
+    for i, (c, score) in enumerate(zip(docs, scores)):
+        update = {"score": score}
+        if i in backfilled:
+            update.update(resume_embedding_fields(backfilled[i]))
+            update.update(vectors_updated_now())
+            if c.get("candidate_id"):
+                matching_engine.add_candidate(c["candidate_id"], backfilled[i])
+        operations.append(UpdateOne({"_id": c["_id"]}, {"$set": update}))
+    await candidates_collection.bulk_write(operations, ordered=False)
+    await job_stats.apply_delta(job["job_id"], rescore_delta(zip(docs, scores)))
+    return len(operations)
+
+def sse_event(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def sse_response(events) -> StreamingResponse:
+    # no-transform/X-Accel-Buffering stop proxies from holding tokens back until the stream ends
+    return StreamingResponse(events, media_type="text/event-stream", headers={
+        "Cache-Control": "no-cache, no-transform",
+        "X-Accel-Buffering": "no"
+    })
+
+async def stream_llm_field(tokens, finish):
+    # Relay tokens as they arrive, then persist the assembled text and send the final result
+    parts = []
+    try:
+        async for text in tokens:
+            parts.append(text)
+            yield sse_event("token", {"text": text})
+        result = await finish("".join(parts).strip())
+        yield sse_event("done", result)
+    except Exception as e:
+        logging.error(f"LLM stream failed: {e}")
+        yield sse_event("error", {"detail": str(e)})
+
+async def candidate_with_job(candidate_id: str):
+    candidate = await candidates_collection.find_one(
+        {"candidate_id": candidate_id}, {"_id": 0, "job_id": 1, "resume_text": 1}
+    )
+    job = await jobs_collection.find_one({"job_id": candidate["job_id"]}) if candidate else None
+    if not candidate or not job:
+        raise HTTPException(status_code=404, detail="Candidate or Job not found")
+    return candidate, job
+
+async def top_candidates_for_insight(job_id: str, limit: int = 5) -> list:
+    # The (job_id, score) index hands back the best candidates without loading the whole pool
+    return await candidates_collection.find(
+        {"job_id": job_id},
+        {"_id": 0, "name": 1, "score": 1, "status": 1, "performance_metrics": 1}
+    ).sort("score", -1).limit(limit).to_list(length=limit)
+
+async def embed_resume_text(resume_text: str) -> np.ndarray:
+    # Concurrent uploads share forward passes through the batcher instead of encoding one by one
+    return (await embedding_batcher.embed([resume_text]))[0]
+
+resume_store = ResumeStore(resumes_collection, extract_resume_text_from_pdf, embed_resume_text)
+resume_queue = ResumeQueue(processing_collection, process_resume_task, fail_resume_task)
+
 # --- API Endpoints ---
 
 @app.get("/jobs")
-async def get_jobs():
-    jobs = []
-    async for job in jobs_collection.find():
-        job["_id"] = str(job["_id"])
-        jobs.append(job)
-    return jobs
+async def get_jobs(
+    after: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = None
+):
+    projection = build_projection(fields, {REQUIREMENT_EMBEDDINGS_FIELD: 0}, {REQUIREMENT_EMBEDDINGS_FIELD})
+    return await paginated_response(jobs_collection, {}, projection, after, limit)
 
 @app.get("/candidates")
-async def get_candidates():
-    candidates = []
-    async for candidate in candidates_collection.find():
-        candidate["_id"] = str(candidate["_id"])
-        candidates.append(candidate)
-    return candidates
+async def get_candidates(
+    after: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = None,
+    job_id: Optional[str] = None,
+    status: Optional[str] = None,
+    min_score: Optional[float] = None,
+    max_score: Optional[float] = None
+):
+    query = {}
+    if job_id:
+        query["job_id"] = job_id
+    statuses = [s.strip() for s in (status or "").split(",") if s.strip()]
+    if statuses:
+        query["status"] = statuses[0] if len(statuses) == 1 else {"$in": statuses}
+    if min_score is not None or max_score is not None:
+        query["score"] = {}
+        if min_score is not None:
+            query["score"]["$gte"] = min_score
+        if max_score is not None:
+            query["score"]["$lte"] = max_score
+    # resume_text is large and only needed on detail views, so it is left out unless asked for
+    projection = build_projection(
+        fields, {"resume_text": 0, **CANDIDATE_BINARY_PROJECTION}, set(CANDIDATE_BINARY_PROJECTION)
+    )
+    return await paginated_response(candidates_collection, query, projection, after, limit)
+
+@app.get("/candidates/{candidate_id}")
+async def get_candidate(candidate_id: str):
+    candidate = await candidates_collection.find_one({"candidate_id": candidate_id}, CANDIDATE_BINARY_PROJECTION)
+    if not candidate:
+        raise HTTPException(status_code=404, detail="Candidate not found")
+    candidate["_id"] = str(candidate["_id"])
+    return candidate
 
 @app.post("/jobs")
 async def create_job(job: Job):
     job_data = job.dict()
     if not job_data.get("job_id"):
         job_data["job_id"] = str(uuid4())
-    result = await jobs_collection.insert_one(job_data)
+    job_data.update(vectors_updated_now())
+    try:
+        result = await jobs_collection.insert_one(job_data)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=409, detail="Job already exists")
     job_data["_id"] = str(result.inserted_id)
+    # Warm the requirement embedding cache so the first upload does not pay for it
+    await matching_engine.update_job(dict(job_data))
     return {"message": "Job created", "job": job_data}
 
+@app.put("/jobs/{job_id}")
+async def update_job(job_id: str, job: Job):
+    existing = await jobs_collection.find_one({"job_id": job_id})
+    if not existing:
+        raise HTTPException(status_code=404, detail="Job not found")
+    changes = {
+        "title": job.title,
+        "description": job.description,
+        "requirements": job.requirements
+    }
+    if job.requirements != existing.get("requirements"):
+        changes.update(vectors_updated_now())
+    await jobs_collection.update_one({"job_id": job_id}, {"$set": changes})
+    updated = {**existing, **changes}
+
+    rescored = 0
+    if job.requirements != existing.get("requirements"):
+        # The stale requirement hash on the document makes the cache recompute only the requirement vectors
+        requirement_embeddings = await requirement_cache.get(updated)
+        rescored = await rescore_job_candidates(updated, requirement_embeddings)
+        await matching_engine.update_job(updated)
+
+    updated.pop(REQUIREMENT_EMBEDDINGS_FIELD, None)
+    updated["_id"] = str(updated["_id"])
+    return {"message": "Job updated", "job": updated, "rescored": rescored}
+
 @app.post("/candidates")
 async def create_candidate(candidate: Candidate):
     candidate_data = candidate.dict()
-    result = await candidates_collection.insert_one(candidate_data)
+    try:
+        result = await candidates_collection.insert_one(candidate_data)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=409, detail="Candidate already exists")
+    await job_stats.insert_candidate(candidate_data)
     candidate_data["_id"] = str(result.inserted_id)
     return {"message": "Candidate created", "candidate": candidate_data}
 
@@ -142,9 +568,11 @@ async def delete_job(job_id: str):
     result = await jobs_collection.delete_one({"job_id": job_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Job not found")
+    requirement_cache.invalidate(job_id)
+    matching_engine.remove_job(job_id)
     return {"message": "Job deleted"}
 
-@app.post("/upload_resume/")
+@app.post("/upload_resume/", status_code=202)
 async def upload_resume(
     job_id: str = Form(...),
     candidate_id: str = Form(...),
@@ -154,76 +582,278 @@ async def upload_resume(
     job = await jobs_collection.find_one({"job_id": job_id})
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
-    
-    resume_text = await extract_resume_text_from_pdf(file)
 
-    # Run all agent calls SEQUENTIALLY to avoid rate limits
-    score_result = await safe_agent_decide(
-        f"Score the following resume for the job requirements.\n\nResume: {resume_text}\nRequirements: {', '.join(job['requirements'])}"
-    )
-    persona_prompt = (
-    f"Analyze the following candidate's resume and the job context. Summarize the candidate's professional persona in one concise sentence, focusing on their strengths, work style, and fit for the role.\n\n"
-    f"Job Title: {job['title']}\n"
-    f"Job Description: {job['description']}\n"
-    f"Requirements: {', '.join(job['requirements'])}\n\n"
-    f"Candidate Resume:\n{resume_text}"
-)
-    persona_result = await safe_agent_decide(persona_prompt)
-    interview_tasks_prompt = (
-    "Given the following job description and candidate resume, generate a numbered list of 3 concise, technical interview tasks that directly assess the candidate's fit for this role. Each task should be clear and actionable.\n\n"
-    f"Job Title: {job['title']}\n"
-    f"Job Description: {job['description']}\n"
-    f"Requirements: {', '.join(job['requirements'])}\n\n"
-    f"Candidate Resume:\n{resume_text}"
-)
-    interview_tasks_result = await safe_agent_decide(interview_tasks_prompt)
-    performance_review_obj = await safe_agent_decide(
-        f"""Generate a performance review and metrics for this candidate.
-Resume: {resume_text}
-Job Title: {job['title']}
-Job Description: {job['description']}
-Requirements: {', '.join(job['requirements'])}"""
-    )
+    # Persist the upload and return immediately; a queue worker runs the pipeline
+    processing_id = str(uuid4())
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    file_path = os.path.join(UPLOAD_DIR, f"{processing_id}.pdf")
+    await asyncio.to_thread(save_upload, file.file, file_path)
+    # The task may be claimed by a worker on another host, which reads the upload back from GridFS
+    try:
+        await upload_store.put(processing_id, file_path)
+    except Exception:
+        os.remove(file_path)
+        raise
 
-    score = extract_agent_output(score_result, float)
-    persona = extract_agent_output(persona_result, str)
-    interview_tasks = extract_agent_output(interview_tasks_result, list)
-    if isinstance(performance_review_obj, dict) and "input" in performance_review_obj:
-        performance_review_obj = performance_review_obj["input"]
-    if isinstance(performance_review_obj, str):
-        try:
-            performance_review_obj = json.loads(performance_review_obj)
-        except Exception:
-            performance_review_obj = {"review": performance_review_obj, "metrics": {}}
     candidate = Candidate(
         candidate_id=candidate_id,
         name=name,
         job_id=job_id,
-        resume_text=resume_text,
-        score=score,
-        persona=persona,
-        interview_tasks=interview_tasks,
-        performance_review=performance_review_obj.get("review", ""),
-        performance_metrics=performance_review_obj.get("metrics", {}),
-        status="screened"
+        status="processing"
     )
     candidate_dict = candidate.dict()
-    candidate_dict["performance_metrics"] = performance_review_obj.get("metrics", {})
-    await candidates_collection.insert_one(candidate_dict)
+    candidate_dict["processing_id"] = processing_id
+    try:
+        await candidates_collection.insert_one(candidate_dict)
+    except DuplicateKeyError:
+        await discard_upload({"file_path": file_path, "upload_id": processing_id})
+        raise HTTPException(status_code=409, detail="Candidate already exists")
+    await job_stats.insert_candidate(candidate_dict)
     candidate_dict.pop("_id", None)
-    return {"message": "Candidate processed", "candidate": candidate_dict}
 
+    await resume_queue.enqueue({
+        "job_id": job_id,
+        "candidate_id": candidate_id,
+        "file_path": file_path,
+        "upload_id": processing_id
+    }, processing_id=processing_id)
+    return {"message": "Resume queued for processing", "processing_id": processing_id, "candidate": candidate_dict}
+
+async def bulk_ingest_events(job: dict, items: list):
+    def event(**fields) -> str:
+        return json.dumps(fields) + "\n"
+
+    pending = [(filename, file_path) for filename, file_path, error in items if not error]
+    # Spooled files not yet handed to the processing queue; whatever is left here is deleted at the end,
+    # including when the client disconnects mid-stream
+    unclaimed = {file_path for _, file_path in pending}
+    semaphore = asyncio.Semaphore(BULK_EXTRACT_CONCURRENCY)
+
+    async def extract(filename: str, file_path: str):
+        async with semaphore:
+            try:
+                return filename, file_path, await resume_store.resolve(file_path, embed=False), None
+            except Exception as e:
+                return filename, file_path, None, e
+
+    async def flush(batch, requirement_embeddings):
+        # Embed and score the whole batch at once, then hand the LLM stages to the shared queue
+        texts = [artifacts.resume_text for _, _, artifacts in batch]
+        missing = [artifacts for _, _, artifacts in batch if artifacts.embedding is None]
+        if missing:
+            for artifacts, embedding in zip(missing, await embedding_batcher.embed([a.resume_text for a in missing])):
+                artifacts.embedding = embedding
+                await resume_store.save_embedding(artifacts)
+        embeddings = np.vstack([artifacts.embedding for _, _, artifacts in batch])
+        scores = score_embeddings(texts, embeddings, job.get("requirements", []), requirement_embeddings)
+        events = []
+        for (filename, file_path, artifacts), embedding, score in zip(batch, embeddings, scores):
+            processing_id = str(uuid4())
+            candidate_id = str(uuid4())
+            await upload_store.put(processing_id, file_path)
+            candidate_dict = Candidate(
+                candidate_id=candidate_id,
+                name=candidate_name_from_filename(filename),
+                job_id=job["job_id"],
+                resume_text=artifacts.resume_text,
+                score=score,
+                status="processing"
+            ).dict()
+            candidate_dict["processing_id"] = processing_id
+            candidate_dict.update(resume_embedding_fields(embedding))
+            candidate_dict["resume_sha256"] = artifacts.file_hash
+            candidate_dict.update(vectors_updated_now())
+            await candidates_collection.insert_one(candidate_dict)
+            await job_stats.insert_candidate(candidate_dict)
+            await resume_queue.enqueue({
+                "job_id": job["job_id"],
+                "candidate_id": candidate_id,
+                "file_path": file_path,
+                "upload_id": processing_id
+            }, processing_id=processing_id)
+            # From here the queue task owns the file and deletes it once processed
+            unclaimed.discard(file_path)
+            events.append(event(
+                file=filename, status="queued", candidate_id=candidate_id, processing_id=processing_id,
+                score=score, reused=artifacts.reused
+            ))
+        return events
+
+    tasks = []
+    try:
+        for filename, _, error in items:
+            if error:
+                yield event(file=filename, status="failed", error=error)
+        if not pending:
+            return
+
+        requirement_embeddings = await requirement_cache.get(job)
+        batch = []
+        tasks = [asyncio.create_task(extract(filename, file_path)) for filename, file_path in pending]
+        for next_done in asyncio.as_completed(tasks):
+            filename, file_path, artifacts, error = await next_done
+            if error is not None or not artifacts.resume_text.strip():
+                unclaimed.discard(file_path)
+                await asyncio.to_thread(remove_files, [file_path])
+                yield event(file=filename, status="failed", error=str(error) if error else "No text could be extracted")
+                continue
+            yield event(file=filename, status="extracted")
+            batch.append((filename, file_path, artifacts))
+            if len(batch) >= BULK_EMBED_BATCH_SIZE:
+                lines, batch = await flush(batch, requirement_embeddings), []
+                for line in lines:
+                    yield line
+        if batch:
+            for line in await flush(batch, requirement_embeddings):
+                yield line
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await asyncio.to_thread(remove_files, unclaimed)
+
+@app.post("/jobs/{job_id}/bulk_upload")
+async def bulk_upload_resumes(job_id: str, files: List[UploadFile] = File(...)):
+    job = await jobs_collection.find_one({"job_id": job_id})
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    # Spool every upload (and every PDF inside a ZIP) to disk before streaming progress,
+    # since the request's temporary files are closed once the endpoint returns
+    items = []
+    try:
+        for file in files:
+            items.extend(await asyncio.to_thread(spool_upload, file.file, file.filename or "resume.pdf", UPLOAD_DIR))
+    except BaseException:
+        await asyncio.to_thread(remove_files, [file_path for _, file_path, _ in items if file_path])
+        raise
+    return StreamingResponse(bulk_ingest_events(job, items), media_type="application/x-ndjson")
+
+@app.get("/processing/{processing_id}")
+async def get_processing_status(processing_id: str):
+    task = await resume_queue.get(processing_id)
+    if not task:
+        raise HTTPException(status_code=404, detail="Processing task not found")
+    response = {
+        "processing_id": processing_id,
+        "status": task["status"],
+        "attempts": task.get("attempts", 0),
+        "error": task.get("error"),
+        "candidate_id": task["payload"].get("candidate_id"),
+        "candidate": None
+    }
+    if task["status"] == "done":
+        candidate = await candidates_collection.find_one(
+            {"candidate_id": response["candidate_id"]}, {"_id": 0, **CANDIDATE_BINARY_PROJECTION}
+        )
+        response["candidate"] = candidate
+    return response
+
+
+@app.get("/jobs/{job_id}/matches")
+async def get_job_matches(job_id: str, k: int = Query(50, ge=1, le=1000), include_applied: bool = True):
+    job = await jobs_collection.find_one({"job_id": job_id})
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    exclude = None
+    if not include_applied:
+        exclude = set(await candidates_collection.distinct("candidate_id", {"job_id": job_id}))
+    hits = await matching_engine.match_candidates(job, k, exclude)
+    if not hits:
+        return {"job_id": job_id, "matches": []}
+
+    # Re-rank the shortlist with the full blended score (semantic + keyword)
+    ids = [candidate_id for candidate_id, _ in hits]
+    docs = {}
+    async for c in candidates_collection.find(
+        {"candidate_id": {"$in": ids}},
+        {"_id": 0, "candidate_id": 1, "name": 1, "job_id": 1, "status": 1, "resume_text": 1}
+    ):
+        docs[c["candidate_id"]] = c
+    vectors = {}
+    for candidate_id in ids:
+        vector = matching_engine.candidate_index.get(candidate_id)
+        if candidate_id not in docs:
+            # Deleted (possibly through another worker) since it was indexed
+            matching_engine.remove_candidate(candidate_id)
+        elif vector is not None:
+            vectors[candidate_id] = vector
+    ids = [candidate_id for candidate_id in ids if candidate_id in vectors]
+    if not ids:
+        return {"job_id": job_id, "matches": []}
+    requirement_embeddings = await requirement_cache.get(job)
+    scores = score_embeddings(
+        [docs[candidate_id].get("resume_text") or "" for candidate_id in ids],
+        np.vstack([vectors[candidate_id] for candidate_id in ids]),
+        job.get("requirements", []),
+        requirement_embeddings
+    )
+    similarity = dict(hits)
+    matches = []
+    for candidate_id, score in zip(ids, scores):
+        match = docs[candidate_id]
+        match.pop("resume_text", None)
+        match["similarity"] = round(similarity[candidate_id] * 100, 2)
+        match["match_score"] = score
+        matches.append(match)
+    matches.sort(key=lambda m: m["match_score"], reverse=True)
+    return {"job_id": job_id, "matches": matches}
+
+@app.get("/candidates/{candidate_id}/matching_jobs")
+async def get_candidate_matching_jobs(candidate_id: str, k: int = Query(10, ge=1, le=100)):
+    hits = await matching_engine.match_jobs(candidate_id, k)
+    if hits is None:
+        raise HTTPException(status_code=404, detail="Candidate not found or has no resume embedding")
+    jobs = {}
+    async for job in jobs_collection.find(
+        {"job_id": {"$in": [job_id for job_id, _ in hits]}},
+        {"_id": 0, "job_id": 1, "title": 1}
+    ):
+        jobs[job["job_id"]] = job
+    for job_id, _ in hits:
+        if job_id not in jobs:
+            matching_engine.remove_job(job_id)
+    return {
+        "candidate_id": candidate_id,
+        "jobs": [
+            {**jobs[job_id], "similarity": round(similarity * 100, 2)}
+            for job_id, similarity in hits if job_id in jobs
+        ]
+    }
+
+@app.get("/jobs/{job_id}/duplicates")
+async def get_job_duplicates(job_id: str, threshold: float = Query(NEAR_DUPLICATE_THRESHOLD, ge=MIN_NEAR_DUPLICATE_THRESHOLD, le=1.0)):
+    job = await jobs_collection.find_one({"job_id": job_id})
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    index = NearDuplicateIndex()
+    names = {}
+    async for c in candidates_collection.find(
+        {"job_id": job_id, "minhash": {"$exists": True}}, {"candidate_id": 1, "name": 1, "minhash": 1}
+    ):
+        index.add(c["candidate_id"], unpack_signature(c["minhash"]))
+        names[c["candidate_id"]] = c.get("name")
+    clusters = [
+        [{"candidate_id": candidate_id, "name": names.get(candidate_id)} for candidate_id in cluster]
+        for cluster in index.clusters(threshold)
+    ]
+    clusters.sort(key=len, reverse=True)
+    return {"job_id": job_id, "threshold": threshold, "clusters": clusters}
 
 @app.patch("/candidates/{candidate_id}/status")
 async def update_candidate_status(candidate_id: str = Path(...), status: str = Body(..., embed=True)):
-    result = await candidates_collection.update_one(
-        {"candidate_id": candidate_id},
-        {"$set": {"status": status}}
-    )
-    if result.matched_count == 0:
+    before = await job_stats.update_candidate({"candidate_id": candidate_id}, {"status": status})
+    if before is None:
         raise HTTPException(status_code=404, detail="Candidate not found")
     return {"message": "Candidate status updated"}
 
+@app.delete("/candidates/{candidate_id}")
+async def delete_candidate(candidate_id: str):
+    deleted = await job_stats.delete_candidate({"candidate_id": candidate_id})
+    if deleted is None:
+        raise HTTPException(status_code=404, detail="Candidate not found")
+    matching_engine.remove_candidate(candidate_id)
+    return {"message": "Candidate deleted"}
+
 @app.post("/evaluate_task/")
 async def evaluate_task(candidate_id: str = Form(...), job_id: str = Form(...), task_submission: str = Form(...)):
     # AI evaluation logic here (implement as needed)
@@ -235,26 +865,27 @@ async def evaluate_task(candidate_id: str = Form(...), job_id: str = Form(...),
     return {"message": "Task evaluated", "evaluation": evaluation}
 
 @app.get("/reports")
-async def get_report(job_id: str):
+async def get_report(
+    job_id: str,
+    include_candidates: bool = True,
+    sort: str = Query("-score", pattern="^-?score$"),
+    skip: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=1000)
+):
     job = await jobs_collection.find_one({"job_id": job_id})
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
+    # Counters come from the job_stats document; only the order statistics touch the candidates index
+    stats = await job_stats.get(job_id)
+    stats.update(await job_score_distribution(candidates_collection, job_id, stats["scoredCandidates"]))
     candidates = []
-    async for c in candidates_collection.find({"job_id": job_id}):
-        candidates.append({
-            "candidate_id": c.get("candidate_id"),
-            "name": c.get("name"),
-            "score": c.get("score"),
-            "status": c.get("status"),
-            "persona": c.get("persona"),
-            "performance_review": c.get("performance_review"),
-            "performance_metrics": c.get("performance_metrics"),
-        })
-    stats = {
-        "totalCandidates": len(candidates),
-        "averageScore": round(sum([c.get("score", 0) or 0 for c in candidates]) / len(candidates), 2) if candidates else 0,
-        "statusBreakdown": {status: sum(1 for c in candidates if c.get("status") == status) for status in set(c.get("status") for c in candidates)}
-    }
+    if include_candidates:
+        cursor = candidates_collection.find({"job_id": job_id}, REPORT_CANDIDATE_PROJECTION).sort(
+            "score", -1 if sort.startswith("-") else 1
+        ).skip(skip)
+        if limit:
+            cursor = cursor.limit(limit)
+        candidates = await cursor.to_list(length=limit)
     return {
         "job": {
             "job_id": job.get("job_id"),
@@ -265,98 +896,159 @@ async def get_report(job_id: str):
         "stats": stats
     }
 
+@app.get("/stats")
+async def get_dashboard_stats():
+    return await job_stats.get_all()
+
+@app.get("/jobs/{job_id}/stats")
+async def get_job_stats(job_id: str):
+    return {"job_id": job_id, **await job_stats.get(job_id)}
+
 @app.get("/export")
-async def export_reports(job_id: str, format: str = "csv"):
-    if format not in ["csv"]:
-        raise HTTPException(status_code=400, detail="Only CSV export is supported currently.")
-    candidates = []
-    async for c in candidates_collection.find({"job_id": job_id}):
-        candidates.append(c)
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow(["Candidate ID", "Name", "Score", "Status", "Persona"])
-    for c in candidates:
-        writer.writerow([
-            c.get("candidate_id", ""),
-            c.get("name", ""),
-            c.get("score", ""),
-            c.get("status", ""),
-            c.get("persona", "")
-        ])
-    output.seek(0)
+async def export_reports(job_id: str, format: str = "csv", gzip: bool = False):
+    try:
+        require_format(format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    # Metric columns are known up front from the job's counters, so the header never needs a second pass
+    metrics = sorted((await job_stats.get(job_id))["averageMetrics"])
+    # Rows stream from the cursor in fixed-size chunks, so memory does not grow with the number of candidates
+    cursor = candidates_collection.find({"job_id": job_id}, EXPORT_PROJECTION).sort("score", -1).batch_size(1000)
+    media_type, extension = EXPORT_FORMATS[format]
+    filename = f"report.{extension}"
+    if gzip:
+        media_type, filename = "application/gzip", f"{filename}.gz"
     return StreamingResponse(
-        output,
-        media_type="text/csv",
-        headers={"Content-Disposition": "attachment; filename=report.csv"}
+        export_stream(cursor, format, metrics, gzip=gzip),
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
     )
 
 @app.post("/candidates/{candidate_id}/regenerate_tasks")
-async def regenerate_interview_tasks(candidate_id: str, job_id: str):
+async def regenerate_interview_tasks(candidate_id: str, job_id: str, clients: LLMClientFactory = Depends(get_llm_clients)):
     candidate = await candidates_collection.find_one({"candidate_id": candidate_id})
     job = await jobs_collection.find_one({"job_id": job_id})
     if not candidate or not job:
         raise HTTPException(status_code=404, detail="Candidate or Job not found")
     resume_text = candidate.get("resume_text", "")
 
-    # Use the exact format expected by your interview_tasks_tool
-    prompt = (
-        f"Resume: {resume_text}\n"
-        f"Job Title: {job['title']}\n"
-        f"Job Description: {job['description']}\n"
-        f"Requirements: {', '.join(job['requirements'])}"
+    # Regenerating means the caller wants a new set of tasks, so bypass the response cache
+    tasks = await generate_interview_tasks_with_langchain(
+        resume_text, job, use_cache=False, llm=clients.chat_model("interview")
     )
 
-    # If you have a safe_agent_decide wrapper, use it; otherwise, use agent_decide directly
-    tasks_result = await agent_decide(prompt)
-    tasks = extract_agent_output(tasks_result, list)
-
     await candidates_collection.update_one(
         {"candidate_id": candidate_id},
         {"$set": {"interview_tasks": tasks}}
     )
     return {"message": "Interview tasks regenerated", "interview_tasks": tasks}
 
+@app.get("/candidates/{candidate_id}/persona/stream")
+async def stream_candidate_persona(candidate_id: str, fresh: bool = False, clients: LLMClientFactory = Depends(get_llm_clients)):
+    candidate, job = await candidate_with_job(candidate_id)
+
+    async def finish(persona: str) -> dict:
+        await candidates_collection.update_one({"candidate_id": candidate_id}, {"$set": {"persona": persona}})
+        return {"persona": persona}
+
+    tokens = stream_persona_with_langchain(
+        candidate.get("resume_text", ""), job, use_cache=not fresh, llm=clients.chat_model("persona")
+    )
+    return sse_response(stream_llm_field(tokens, finish))
+
+@app.get("/candidates/{candidate_id}/performance_review/stream")
+async def stream_candidate_performance_review(candidate_id: str, fresh: bool = False, clients: LLMClientFactory = Depends(get_llm_clients)):
+    candidate, job = await candidate_with_job(candidate_id)
+
+    async def finish(content: str) -> dict:
+        parsed = parse_performance_review(content)
+        review = {"performance_review": parsed.get("review", ""), "performance_metrics": parsed.get("metrics", {})}
+        # Metrics feed the job's counters, so this goes through job_stats
+        await job_stats.update_candidate({"candidate_id": candidate_id}, review)
+        return review
+
+    tokens = stream_performance_review_with_langchain(
+        candidate.get("resume_text", ""), job, use_cache=not fresh, llm=clients.chat_model("performance")
+    )
+    return sse_response(stream_llm_field(tokens, finish))
+
 @app.get("/job/{job_id}")
 async def get_job(job_id: str):
-    job = await jobs_collection.find_one({"job_id": job_id})
+    job = await jobs_collection.find_one({"job_id": job_id}, {REQUIREMENT_EMBEDDINGS_FIELD: 0})
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     job["_id"] = str(job["_id"])
     return job
 
 @app.get("/ai_insights")
-async def ai_insights(job_id: str):
+async def ai_insights(job_id: str, fresh: bool = False, clients: LLMClientFactory = Depends(get_llm_clients)):
     job = await jobs_collection.find_one({"job_id": job_id})
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
-    candidates = []
-    async for c in candidates_collection.find({"job_id": job_id}):
-        candidates.append({
-            "name": c.get("name"),
-            "score": c.get("score"),
-            "status": c.get("status"),
-            "performance_metrics": c.get("performance_metrics"),
-        })
     # Only include the top 5 candidates by score
-    candidates = sorted(candidates, key=lambda x: x.get("score", 0), reverse=True)[:5]
-    prompt = f"""
-    Given the following job description and candidate data, generate a concise, professional insight summary (4-6 sentences) for a hiring manager. Highlight strengths, weaknesses, and trends in the candidate pool, and suggest actionable recommendations.
-
-    Job Title: {job.get('title')}
-    Job Requirements: {', '.join(job.get('requirements', []))}
-
-    Candidates:
-    {json.dumps(candidates, indent=2)}
-    """
+    candidates = await top_candidates_for_insight(job_id)
     from openai import RateLimitError
 
     try:
-        insight = await safe_agent_decide(prompt)
+        # A plain summarisation prompt needs no tools, so it goes straight to the insights chain
+        insight = await generate_insights_with_langchain(
+            job, candidates, use_cache=not fresh, llm=clients.chat_model("insights")
+        )
     except RateLimitError:
         raise HTTPException(status_code=429, detail="AI rate limit reached. Please try again in a few seconds.")
 
     # FIX: Return the insight!
     return {"insight": insight}
 
+@app.get("/ai_insights/stream")
+async def stream_ai_insights(job_id: str, fresh: bool = False, clients: LLMClientFactory = Depends(get_llm_clients)):
+    job = await jobs_collection.find_one({"job_id": job_id})
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    candidates = await top_candidates_for_insight(job_id)
+
+    async def finish(insight: str) -> dict:
+        await jobs_collection.update_one({"job_id": job_id}, {"$set": {"ai_insight": insight}})
+        return {"insight": insight}
+
+    tokens = stream_insights_with_langchain(job, candidates, use_cache=not fresh, llm=clients.chat_model("insights"))
+    return sse_response(stream_llm_field(tokens, finish))
+
+@app.get("/ready")
+async def get_readiness():
+    models = {"sbert": sbert_model_loaded()}
+    if RESUME_PIPELINE == "agent":
+        from ai_agents.hr_agent import agent_loaded
+
+        models["agent"] = agent_loaded()
+    if MODEL_WARMUP:
+        ready = all(models.values())
+    else:
+        # Nothing loads the models until a request needs them, so waiting for them here would keep
+        # the pod out of rotation forever; the first requests pay the load instead
+        ready = True
+        models = {name: loaded or "lazy" for name, loaded in models.items()}
+    return FastJSONResponse(
+        status_code=200 if ready else 503,
+        content={"ready": ready, "models": models, "embedding_backend": embedding_backend(), "warmup": model_status}
+    )
+
+@app.get("/diagnostics/query_plans")
+async def get_query_plans():
+    # Runs explain() on the app's canonical queries and flags any that fall back to a collection scan
+    report = await explain_queries(db)
+    return {"collscans": sum(1 for entry in report if entry.get("collscan")), "queries": report}
+
+@app.get("/metrics")
+async def get_metrics():
+    return {
+        "llm_cache": llm_cache.snapshot(),
+        "llm_limiter": llm_limiter.stats,
+        "processing_queue": await resume_queue.depth(),
+        "pdf_extraction": pdf_extractor.snapshot(),
+        "embedding_batcher": embedding_batcher.snapshot(),
+        "resume_dedup": resume_store.stats
+    }
+
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
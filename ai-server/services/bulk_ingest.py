@@ -0,0 +1,77 @@
+import os
+import shutil
+import zipfile
+from typing import BinaryIO, List, Tuple
+from uuid import uuid4
+
+BULK_MAX_FILE_BYTES = int(os.getenv("BULK_MAX_FILE_BYTES", str(20 * 1024 * 1024)))
+COPY_CHUNK_BYTES = 1024 * 1024
+
+def _copy_limited(source: BinaryIO, file_path: str, max_bytes: int):
+    # Copy in fixed-size chunks so a large upload never sits in memory as a whole
+    written = 0
+    with open(file_path, "wb") as out:
+        while True:
+            chunk = source.read(COPY_CHUNK_BYTES)
+            if not chunk:
+                break
+            written += len(chunk)
+            if written > max_bytes:
+                raise ValueError(f"File exceeds {max_bytes} bytes")
+            out.write(chunk)
+
+def _is_resume_member(info: zipfile.ZipInfo) -> bool:
+    name = info.filename
+    return (
+        not info.is_dir()
+        and name.lower().endswith(".pdf")
+        and not name.startswith("__MACOSX/")
+        and not os.path.basename(name).startswith(".")
+    )
+
+# Writes one uploaded file (a PDF or a ZIP of PDFs) to upload_dir and returns
+# (filename, path, error) tuples; path is empty when error is set
+def spool_upload(source: BinaryIO, filename: str, upload_dir: str) -> List[Tuple[str, str, str]]:
+    os.makedirs(upload_dir, exist_ok=True)
+    if not filename.lower().endswith(".zip"):
+        file_path = os.path.join(upload_dir, f"{uuid4()}.pdf")
+        try:
+            _copy_limited(source, file_path, BULK_MAX_FILE_BYTES)
+        except Exception as e:
+            if os.path.exists(file_path):
+                os.remove(file_path)
+            return [(filename, "", str(e))]
+        return [(filename, file_path, "")]
+
+    # The archive itself is spooled to disk first so members can be read with random access
+    archive_path = os.path.join(upload_dir, f"{uuid4()}.zip")
+    with open(archive_path, "wb") as out:
+        shutil.copyfileobj(source, out, COPY_CHUNK_BYTES)
+    items = []
+    try:
+        with zipfile.ZipFile(archive_path) as archive:
+            for info in archive.infolist():
+                if not _is_resume_member(info):
+                    continue
+                member_name = os.path.basename(info.filename)
+                if info.file_size > BULK_MAX_FILE_BYTES:
+                    items.append((member_name, "", f"File exceeds {BULK_MAX_FILE_BYTES} bytes"))
+                    continue
+                file_path = os.path.join(upload_dir, f"{uuid4()}.pdf")
+                try:
+                    with archive.open(info) as member:
+                        _copy_limited(member, file_path, BULK_MAX_FILE_BYTES)
+                    items.append((member_name, file_path, ""))
+                except Exception as e:
+                    if os.path.exists(file_path):
+                        os.remove(file_path)
+                    items.append((member_name, "", str(e)))
+    except zipfile.BadZipFile as e:
+        items.append((filename, "", f"Invalid ZIP archive: {e}"))
+    finally:
+        os.remove(archive_path)
+    return items
+
+def candidate_name_from_filename(filename: str) -> str:
+    stem = os.path.splitext(os.path.basename(filename))[0]
+    return " ".join(stem.replace("_", " ").replace("-", " ").split()).title() or "Unnamed Candidate"
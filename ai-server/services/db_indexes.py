@@ -0,0 +1,125 @@
+import asyncio
+import json
+import logging
+import os
+import sys
+from typing import List
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+logger = logging.getLogger(__name__)
+
+# Every hot query filters on one of these keys; declared here so startup can ensure them
+INDEXES = {
+    "jobs": [
+        IndexModel([("job_id", ASCENDING)], unique=True, name="job_id_unique"),
+        IndexModel([("vectors_updated_at", ASCENDING)], name="vectors_updated_at", sparse=True),
+    ],
+    "candidates": [
+        IndexModel([("candidate_id", ASCENDING)], unique=True, name="candidate_id_unique"),
+        IndexModel([("job_id", ASCENDING), ("score", DESCENDING)], name="job_id_score"),
+        IndexModel([("job_id", ASCENDING), ("status", ASCENDING)], name="job_id_status"),
+        # Multikey: one entry per LSH band of the resume's MinHash signature
+        IndexModel([("lsh_bands", ASCENDING)], name="lsh_bands", sparse=True),
+        # Matching index refresh polls for vectors written by other workers
+        IndexModel([("vectors_updated_at", ASCENDING)], name="vectors_updated_at", sparse=True),
+    ],
+    "processing_jobs": [
+        IndexModel([("status", ASCENDING), ("available_at", ASCENDING)], name="status_available_at"),
+        IndexModel([("status", ASCENDING), ("lease_expires_at", ASCENDING)], name="status_lease_expires_at"),
+    ],
+    "resumes": [
+        IndexModel([("text_sha256", ASCENDING)], name="text_sha256"),
+    ],
+}
+
+# Indexes created by earlier versions that no query uses any more; dropped at startup so writes stop paying for them
+DROPPED_INDEXES = {
+    "candidates": ["resume_sha256"],
+}
+
+# (collection, filter, sort) for the queries the API runs on every request path
+CANONICAL_QUERIES = [
+    ("jobs", {"job_id": "__probe__"}, None),
+    ("candidates", {"candidate_id": "__probe__"}, None),
+    ("candidates", {"job_id": "__probe__"}, None),
+    ("candidates", {"job_id": "__probe__"}, [("score", DESCENDING)]),
+    ("candidates", {"job_id": "__probe__", "status": "screened"}, None),
+    ("candidates", {"lsh_bands": {"$in": [0]}}, None),
+    ("processing_jobs", {"status": "queued", "available_at": {"$lte": 0}}, [("available_at", ASCENDING)]),
+    ("resumes", {"text_sha256": "__probe__"}, None),
+]
+
+async def ensure_indexes(db) -> dict:
+    created = {}
+    for collection_name, indexes in INDEXES.items():
+        collection = db[collection_name]
+        created[collection_name] = []
+        for index in indexes:
+            try:
+                created[collection_name].extend(await collection.create_indexes([index]))
+            except OperationFailure as e:
+                # Usually existing duplicates blocking a unique index; the app still works without it
+                logger.error(f"Could not create index {index.document['name']} on {collection_name}: {e}")
+    for collection_name, names in DROPPED_INDEXES.items():
+        for name in names:
+            try:
+                await db[collection_name].drop_index(name)
+                logger.info(f"Dropped unused index {name} on {collection_name}")
+            except OperationFailure:
+                # Already gone (or never created)
+                pass
+    return created
+
+def _plan_stages(plan) -> List[str]:
+    stages = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        for value in plan.values():
+            stages.extend(_plan_stages(value))
+    elif isinstance(plan, list):
+        for item in plan:
+            stages.extend(_plan_stages(item))
+    return stages
+
+async def explain_queries(db) -> List[dict]:
+    report = []
+    for collection_name, query, sort in CANONICAL_QUERIES:
+        cursor = db[collection_name].find(query)
+        if sort:
+            cursor = cursor.sort(sort)
+        try:
+            explained = await cursor.explain()
+        except OperationFailure as e:
+            report.append({"collection": collection_name, "filter": query, "sort": sort, "error": str(e)})
+            continue
+        stages = _plan_stages(explained.get("queryPlanner", {}).get("winningPlan", {}))
+        report.append({
+            "collection": collection_name,
+            "filter": query,
+            "sort": sort,
+            "stages": stages,
+            "collscan": "COLLSCAN" in stages,
+            "in_memory_sort": "SORT" in stages
+        })
+    return report
+
+if __name__ == "__main__":
+    # python -m services.db_indexes [ensure|explain]
+    import motor.motor_asyncio
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+    async def main(command: str):
+        client = motor.motor_asyncio.AsyncIOMotorClient(os.getenv("MONGODB_URI"))
+        db = client.smart_recruitment
+        if command == "ensure":
+            print(json.dumps(await ensure_indexes(db), indent=2))
+            return 0
+        report = await explain_queries(db)
+        print(json.dumps(report, indent=2, default=str))
+        return 1 if any(entry.get("collscan") for entry in report) else 0
+
+    sys.exit(asyncio.run(main(sys.argv[1] if len(sys.argv) > 1 else "explain")))
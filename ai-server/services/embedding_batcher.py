@@ -0,0 +1,156 @@
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
+import numpy as np
+
+from chains.scoring_chain import encode_texts
+
+logger = logging.getLogger(__name__)
+
+# A batch is encoded once it holds this many texts or its first request has waited this long
+EMBED_BATCH_MAX_SIZE = int(os.getenv("EMBED_BATCH_MAX_SIZE", "32"))
+EMBED_BATCH_MAX_WAIT_MS = float(os.getenv("EMBED_BATCH_MAX_WAIT_MS", "5"))
+# Upper bounds of the batch-size histogram reported by snapshot()
+BATCH_SIZE_BUCKETS = [1, 2, 4, 8, 16, 32, 64, 128]
+
+def _bucket(size: int) -> str:
+    for bound in BATCH_SIZE_BUCKETS:
+        if size <= bound:
+            return f"<={bound}"
+    return f">{BATCH_SIZE_BUCKETS[-1]}"
+
+class EmbeddingBatcher:
+    # Coalesces encode calls from concurrent requests into shared forward passes. Callers queue their
+    # texts and await a future; one worker collects whatever arrives within the wait window and runs
+    # a single encode on a dedicated thread, so the model never sees a pile of batch-size-1 calls.
+    def __init__(
+        self,
+        encode: Callable[[List[str]], np.ndarray] = encode_texts,
+        max_batch_size: int = EMBED_BATCH_MAX_SIZE,
+        max_wait_ms: float = EMBED_BATCH_MAX_WAIT_MS
+    ):
+        self.encode = encode
+        self.max_batch_size = max_batch_size
+        self.max_wait_seconds = max_wait_ms / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.stats = {
+            "requests": 0,
+            "texts": 0,
+            "batches": 0,
+            "failed_batches": 0,
+            "max_batch_size": 0,
+            "total_wait_seconds": 0.0,
+            "max_wait_seconds": 0.0,
+            "total_encode_seconds": 0.0,
+            "max_encode_seconds": 0.0,
+            "batch_sizes": {}
+        }
+
+    def start(self):
+        if self._task is not None and not self._task.done():
+            return
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        # A single thread owns the model, so batches run back to back instead of fighting over cores
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embedding-batcher")
+        self._task = asyncio.create_task(self._worker())
+
+    async def stop(self):
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        # Fail anything still queued so no caller waits forever
+        while self._queue is not None and not self._queue.empty():
+            _, future, _ = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Embedding batcher stopped"))
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        self._loop = None
+
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        loop = asyncio.get_running_loop()
+        if self._loop is not None and self._loop is not loop:
+            # Called from another event loop (a script or a nested asyncio.run): encode directly
+            return await asyncio.to_thread(self.encode, texts)
+        self.start()
+        future = loop.create_future()
+        self._queue.put_nowait((list(texts), future, time.perf_counter()))
+        return await future
+
+    async def _worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            size = len(batch[0][0])
+            deadline = loop.time() + self.max_wait_seconds
+            while size < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0 and self._queue.empty():
+                    break
+                try:
+                    item = self._queue.get_nowait() if remaining <= 0 else await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(item)
+                size += len(item[0])
+            await self._run(batch)
+
+    async def _run(self, batch: list):
+        # Callers that gave up (client disconnected) do not cost a forward pass
+        batch = [item for item in batch if not item[1].done()]
+        if not batch:
+            return
+        texts = [text for item_texts, _, _ in batch for text in item_texts]
+        started = time.perf_counter()
+        for _, _, enqueued in batch:
+            waited = started - enqueued
+            self.stats["total_wait_seconds"] += waited
+            self.stats["max_wait_seconds"] = max(self.stats["max_wait_seconds"], waited)
+        try:
+            embeddings = await asyncio.get_running_loop().run_in_executor(self._executor, self.encode, texts)
+        except Exception as e:
+            self.stats["failed_batches"] += 1
+            logger.error(f"Embedding batch of {len(texts)} texts failed: {e}")
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        elapsed = time.perf_counter() - started
+        self.stats["batches"] += 1
+        self.stats["requests"] += len(batch)
+        self.stats["texts"] += len(texts)
+        self.stats["max_batch_size"] = max(self.stats["max_batch_size"], len(texts))
+        self.stats["total_encode_seconds"] += elapsed
+        self.stats["max_encode_seconds"] = max(self.stats["max_encode_seconds"], elapsed)
+        bucket = _bucket(len(texts))
+        self.stats["batch_sizes"][bucket] = self.stats["batch_sizes"].get(bucket, 0) + 1
+
+        offset = 0
+        for item_texts, future, _ in batch:
+            if not future.done():
+                future.set_result(embeddings[offset:offset + len(item_texts)])
+            offset += len(item_texts)
+
+    def snapshot(self) -> dict:
+        batches, requests = self.stats["batches"], self.stats["requests"]
+        return {
+            **self.stats,
+            "config": {"max_batch_size": self.max_batch_size, "max_wait_ms": self.max_wait_seconds * 1000},
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "avg_batch_size": round(self.stats["texts"] / batches, 2) if batches else 0.0,
+            "avg_wait_ms": round(self.stats["total_wait_seconds"] / requests * 1000, 3) if requests else 0.0,
+            "avg_encode_ms": round(self.stats["total_encode_seconds"] / batches * 1000, 3) if batches else 0.0
+        }
+
+embedding_batcher = EmbeddingBatcher()
@@ -0,0 +1,99 @@
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from typing import List, Optional
+import numpy as np
+
+from chains.scoring_chain import embedding_model_id
+from services.embedding_batcher import embedding_batcher
+
+logger = logging.getLogger(__name__)
+
+# Field on the job document holding the persisted requirement embeddings
+REQUIREMENT_EMBEDDINGS_FIELD = "requirement_embeddings"
+# Stored next to resume embeddings (candidates and resumes) with embedding_model_id()
+EMBEDDING_MODEL_FIELD = "embedding_model"
+# Resume embeddings stored before they were tagged all came from the default model on torch
+LEGACY_EMBEDDING_MODEL = "all-MiniLM-L6-v2:torch"
+
+def requirements_hash(requirements: List[str]) -> str:
+    # Keyed by the model too: changing SBERT_MODEL_NAME or EMBEDDING_BACKEND invalidates stored vectors
+    payload = {"model": embedding_model_id(), "requirements": list(requirements)}
+    return hashlib.sha256(json.dumps(payload, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+def pack_embeddings(embeddings: np.ndarray) -> bytes:
+    # float16 halves the stored size; cosine scores move by well under 0.01
+    return np.asarray(embeddings, dtype=np.float16).tobytes()
+
+def unpack_embeddings(blob: bytes, dim: int) -> np.ndarray:
+    return np.frombuffer(blob, dtype=np.float16).astype(np.float32).reshape(-1, dim)
+
+def unpack_vector(blob: bytes) -> np.ndarray:
+    return np.frombuffer(blob, dtype=np.float16).astype(np.float32)
+
+def resume_embedding_fields(embedding: np.ndarray) -> dict:
+    return {"resume_embedding": pack_embeddings(embedding), EMBEDDING_MODEL_FIELD: embedding_model_id()}
+
+def current_resume_embedding(doc: dict) -> Optional[np.ndarray]:
+    # None when the document has no embedding or one from a different model
+    if not doc.get("resume_embedding") or doc.get(EMBEDDING_MODEL_FIELD, LEGACY_EMBEDDING_MODEL) != embedding_model_id():
+        return None
+    return unpack_vector(doc["resume_embedding"])
+
+def current_embedding_query() -> dict:
+    # Mongo filter for documents whose resume embedding belongs to the current model
+    model = embedding_model_id()
+    if model == LEGACY_EMBEDDING_MODEL:
+        return {"resume_embedding": {"$exists": True}, EMBEDDING_MODEL_FIELD: {"$in": [model, None]}}
+    return {"resume_embedding": {"$exists": True}, EMBEDDING_MODEL_FIELD: model}
+
+class RequirementEmbeddingCache:
+    def __init__(self, jobs_collection, max_jobs: int = 1024):
+        self.jobs_collection = jobs_collection
+        self.max_jobs = max_jobs
+        self._entries = OrderedDict()  # job_id -> (requirements hash, embeddings)
+
+    def _remember(self, job_id: str, req_hash: str, embeddings: np.ndarray):
+        self._entries[job_id] = (req_hash, embeddings)
+        self._entries.move_to_end(job_id)
+        while len(self._entries) > self.max_jobs:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, job_id: str):
+        self._entries.pop(job_id, None)
+
+    async def get(self, job: dict) -> Optional[np.ndarray]:
+        requirements = job.get("requirements", [])
+        if not requirements:
+            return None
+        job_id = job.get("job_id")
+        req_hash = requirements_hash(requirements)
+
+        cached = self._entries.get(job_id)
+        if cached and cached[0] == req_hash:
+            self._entries.move_to_end(job_id)
+            return cached[1]
+
+        stored = job.get(REQUIREMENT_EMBEDDINGS_FIELD)
+        if stored and stored.get("hash") == req_hash:
+            embeddings = unpack_embeddings(stored["blob"], stored["dim"])
+            self._remember(job_id, req_hash, embeddings)
+            return embeddings
+
+        # Requirements changed (or never embedded): recompute and persist with the job
+        embeddings = await embedding_batcher.embed(requirements)
+        self._remember(job_id, req_hash, embeddings)
+        try:
+            await self.jobs_collection.update_one(
+                {"job_id": job_id},
+                {"$set": {REQUIREMENT_EMBEDDINGS_FIELD: {
+                    "hash": req_hash,
+                    "model": embedding_model_id(),
+                    "dim": int(embeddings.shape[1]),
+                    "blob": pack_embeddings(embeddings)
+                }}}
+            )
+        except Exception as e:
+            logger.warning(f"Failed to persist requirement embeddings for job {job_id}: {e}")
+        return embeddings
@@ -0,0 +1,154 @@
+import csv
+import io
+import json
+import os
+import zlib
+from typing import AsyncIterator, Dict, List
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrow")
+}
+# Rows per chunk (and per Parquet row group); memory stays bounded by this, not by the job size
+EXPORT_CHUNK_ROWS = int(os.getenv("EXPORT_CHUNK_ROWS", "1000"))
+EXPORT_PROJECTION = {
+    "_id": 0,
+    "candidate_id": 1,
+    "name": 1,
+    "score": 1,
+    "status": 1,
+    "persona": 1,
+    "performance_metrics": 1
+}
+BASE_COLUMNS = ["candidate_id", "name", "score", "status", "persona"]
+CSV_HEADERS = ["Candidate ID", "Name", "Score", "Status", "Persona"]
+
+def require_format(fmt: str):
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format '{fmt}'. Use one of: {', '.join(EXPORT_FORMATS)}")
+    if fmt in ("parquet", "arrow"):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ValueError(f"{fmt} export requires pyarrow to be installed")
+
+def _metric(candidate: dict, name: str):
+    value = (candidate.get("performance_metrics") or {}).get(name)
+    return value if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+async def _chunks(cursor) -> AsyncIterator[List[dict]]:
+    chunk = []
+    async for candidate in cursor:
+        chunk.append(candidate)
+        if len(chunk) >= EXPORT_CHUNK_ROWS:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+async def _csv_rows(cursor, metrics: List[str]) -> AsyncIterator[bytes]:
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(CSV_HEADERS + [name.replace("_", " ").title() for name in metrics])
+    async for chunk in _chunks(cursor):
+        for c in chunk:
+            values = [_metric(c, name) for name in metrics]
+            writer.writerow([c.get(column, "") for column in BASE_COLUMNS] + ["" if v is None else v for v in values])
+        yield output.getvalue().encode("utf-8")
+        output.seek(0)
+        output.truncate()
+    if output.tell():
+        yield output.getvalue().encode("utf-8")
+
+async def _ndjson_rows(cursor) -> AsyncIterator[bytes]:
+    async for chunk in _chunks(cursor):
+        yield "".join(json.dumps(c, default=str) + "\n" for c in chunk).encode("utf-8")
+
+class _ByteSink(io.RawIOBase):
+    # Write-only file that hands the bytes written so far to the response generator
+    def __init__(self):
+        self._buffer = bytearray()
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def write(self, data) -> int:
+        self._buffer.extend(data)
+        self._position += len(data)
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+def _arrow_schema(metrics: List[str]):
+    import pyarrow as pa
+
+    return pa.schema(
+        [
+            ("candidate_id", pa.string()),
+            ("name", pa.string()),
+            ("score", pa.float64()),
+            ("status", pa.string()),
+            ("persona", pa.string())
+        ] + [(f"metric_{name}", pa.float64()) for name in metrics]
+    )
+
+def _record_batch(chunk: List[dict], schema, metrics: List[str]):
+    import pyarrow as pa
+
+    columns: Dict[str, list] = {
+        "candidate_id": [c.get("candidate_id") for c in chunk],
+        "name": [c.get("name") for c in chunk],
+        "score": [float(c["score"]) if isinstance(c.get("score"), (int, float)) else None for c in chunk],
+        "status": [c.get("status") for c in chunk],
+        "persona": [c.get("persona") if isinstance(c.get("persona"), str) else None for c in chunk]
+    }
+    for name in metrics:
+        columns[f"metric_{name}"] = [_metric(c, name) for c in chunk]
+    return pa.RecordBatch.from_pydict(columns, schema=schema)
+
+async def _columnar_rows(cursor, metrics: List[str], fmt: str) -> AsyncIterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _arrow_schema(metrics)
+    sink = _ByteSink()
+    if fmt == "parquet":
+        writer = pq.ParquetWriter(sink, schema, compression="snappy")
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+    try:
+        async for chunk in _chunks(cursor):
+            # One row group (or IPC batch) per chunk, flushed to the client straight away
+            writer.write_batch(_record_batch(chunk, schema, metrics))
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        writer.close()
+    yield sink.drain()
+
+async def _gzipped(rows: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    async for data in rows:
+        compressed = compressor.compress(data)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+def export_stream(cursor, fmt: str, metrics: List[str], gzip: bool = False) -> AsyncIterator[bytes]:
+    if fmt == "csv":
+        rows = _csv_rows(cursor, metrics)
+    elif fmt == "ndjson":
+        rows = _ndjson_rows(cursor)
+    else:
+        rows = _columnar_rows(cursor, metrics, fmt)
+    return _gzipped(rows) if gzip else rows
@@ -0,0 +1,196 @@
+import asyncio
+import json
+import logging
+import math
+import os
+import sys
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Optional, Tuple
+from pymongo import ReturnDocument
+
+logger = logging.getLogger(__name__)
+
+SCORE_BUCKET_WIDTH = 10
+# Candidate fields the counters are derived from; writes that touch them fetch these as the "before" image
+STATS_FIELDS = {"_id": 0, "job_id": 1, "status": 1, "score": 1, "performance_metrics": 1}
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+def _field_key(value) -> str:
+    # Statuses and metric names become field names, so keep them valid MongoDB keys
+    key = str(value).replace(".", "_").replace("$", "_") if value is not None else ""
+    return key or "unknown"
+
+def score_bucket(score: float) -> int:
+    return min(max(int(score // SCORE_BUCKET_WIDTH), 0), 100 // SCORE_BUCKET_WIDTH - 1) * SCORE_BUCKET_WIDTH
+
+def _compact(counters: Dict[str, float]) -> Dict[str, float]:
+    # Drop zero deltas and keep counts integral so $inc does not turn them into doubles
+    return {
+        field: int(value) if float(value).is_integer() else value
+        for field, value in counters.items() if value
+    }
+
+def candidate_contribution(candidate: Optional[dict]) -> Dict[str, float]:
+    if not candidate:
+        return {}
+    counters = {"total": 1, f"status.{_field_key(candidate.get('status'))}": 1}
+    score = candidate.get("score")
+    if _is_number(score):
+        counters["score_sum"] = score
+        counters["score_count"] = 1
+        counters[f"score_buckets.{score_bucket(score)}"] = 1
+    metrics = candidate.get("performance_metrics")
+    if isinstance(metrics, dict):
+        for name, value in metrics.items():
+            if _is_number(value):
+                counters[f"metric_sums.{_field_key(name)}"] = value
+                counters[f"metric_counts.{_field_key(name)}"] = 1
+    return counters
+
+def candidate_delta(before: Optional[dict], after: Optional[dict]) -> Dict[str, float]:
+    delta = defaultdict(float)
+    for field, value in candidate_contribution(after).items():
+        delta[field] += value
+    for field, value in candidate_contribution(before).items():
+        delta[field] -= value
+    return _compact(delta)
+
+def summarize(doc: Optional[dict]) -> dict:
+    doc = doc or {}
+    total = doc.get("total", 0)
+    buckets = doc.get("score_buckets", {})
+    metric_sums = doc.get("metric_sums", {})
+    metric_counts = doc.get("metric_counts", {})
+    return {
+        "totalCandidates": total,
+        # Unscored candidates count as 0, as the report always has
+        "averageScore": round(doc.get("score_sum", 0) / total, 2) if total else 0,
+        "scoredCandidates": doc.get("score_count", 0),
+        "statusBreakdown": {status: count for status, count in doc.get("status", {}).items() if count},
+        "scoreHistogram": [
+            {"min": lower, "max": lower + SCORE_BUCKET_WIDTH, "count": buckets.get(str(lower), 0)}
+            for lower in range(0, 100, SCORE_BUCKET_WIDTH)
+        ],
+        "averageMetrics": {
+            name: round(metric_sums[name] / count, 2)
+            for name, count in metric_counts.items() if count and name in metric_sums
+        }
+    }
+
+def _merge(docs: Iterable[dict]) -> dict:
+    merged = defaultdict(float)
+    for doc in docs:
+        for field, value in doc.items():
+            if isinstance(value, dict):
+                for key, inner in value.items():
+                    merged[f"{field}.{key}"] += inner
+            elif _is_number(value):
+                merged[field] += value
+    nested = {}
+    for field, value in _compact(merged).items():
+        if "." in field:
+            outer, inner = field.split(".", 1)
+            nested.setdefault(outer, {})[inner] = value
+        else:
+            nested[field] = value
+    return nested
+
+class JobStats:
+    # Per-job counters kept in step with the candidates collection by $inc deltas on every write,
+    # so dashboard reads are a single document fetch however many applicants a job has.
+    # The delta and the candidate write are separate operations; rebuild() repairs any drift.
+    def __init__(self, collection, candidates_collection):
+        self.collection = collection
+        self.candidates_collection = candidates_collection
+
+    async def apply(self, job_id: Optional[str], before: Optional[dict], after: Optional[dict]):
+        await self.apply_delta(job_id, candidate_delta(before, after))
+
+    async def apply_delta(self, job_id: Optional[str], delta: Dict[str, float]):
+        if not job_id or not delta:
+            return
+        await self.collection.update_one(
+            {"_id": job_id},
+            {"$inc": delta, "$set": {"updated_at": datetime.now(timezone.utc)}},
+            upsert=True
+        )
+
+    async def insert_candidate(self, candidate: dict):
+        await self.apply(candidate.get("job_id"), None, candidate)
+
+    async def update_candidate(self, query: dict, changes: dict) -> Optional[dict]:
+        # find_one_and_update hands back the exact prior state, so concurrent writers still produce exact deltas
+        before = await self.candidates_collection.find_one_and_update(
+            query, {"$set": changes}, projection=STATS_FIELDS, return_document=ReturnDocument.BEFORE
+        )
+        if before is not None:
+            await self.apply(before.get("job_id"), before, {**before, **changes})
+        return before
+
+    async def delete_candidate(self, query: dict) -> Optional[dict]:
+        before = await self.candidates_collection.find_one_and_delete(query, projection={**STATS_FIELDS, "candidate_id": 1})
+        if before is not None:
+            await self.apply(before.get("job_id"), before, None)
+        return before
+
+    async def get(self, job_id: str) -> dict:
+        return summarize(await self.collection.find_one({"_id": job_id}))
+
+    async def get_all(self) -> dict:
+        # One small document per job, independent of the number of candidates
+        docs = await self.collection.find({}, {"_id": 0, "updated_at": 0}).to_list(length=None)
+        return {**summarize(_merge(docs)), "totalJobs": len(docs)}
+
+    async def ensure_built(self):
+        # First start after upgrading: backfill the counters from existing candidates
+        if await self.collection.estimated_document_count() == 0 and await self.candidates_collection.estimated_document_count() > 0:
+            await self.rebuild()
+
+    async def rebuild(self, job_id: Optional[str] = None) -> Dict[str, int]:
+        query = {"job_id": job_id} if job_id else {}
+        counters: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        async for c in self.candidates_collection.find(query, STATS_FIELDS):
+            for field, value in candidate_contribution(c).items():
+                counters[c.get("job_id")][field] += value
+        counters.pop(None, None)
+
+        now = datetime.now(timezone.utc)
+        for stats_job_id, fields in counters.items():
+            doc = _merge([fields])
+            await self.collection.replace_one({"_id": stats_job_id}, {**doc, "updated_at": now}, upsert=True)
+        if job_id and job_id not in counters:
+            await self.collection.delete_one({"_id": job_id})
+        elif not job_id:
+            await self.collection.delete_many({"_id": {"$nin": list(counters)}})
+        logger.info(f"Rebuilt job stats for {len(counters)} jobs")
+        return {stats_job_id: int(fields.get("total", 0)) for stats_job_id, fields in counters.items()}
+
+def rescore_delta(changes: Iterable[Tuple[dict, float]]) -> Dict[str, float]:
+    # (candidate with its old score, new score) pairs folded into one $inc for the job
+    delta = defaultdict(float)
+    for candidate, new_score in changes:
+        for field, value in candidate_delta(candidate, {**candidate, "score": new_score}).items():
+            delta[field] += value
+    return _compact(delta)
+
+if __name__ == "__main__":
+    # python -m services.job_stats rebuild [job_id]
+    import motor.motor_asyncio
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+    async def main(args):
+        if not args or args[0] != "rebuild":
+            print("usage: python -m services.job_stats rebuild [job_id]")
+            return 2
+        client = motor.motor_asyncio.AsyncIOMotorClient(os.getenv("MONGODB_URI"))
+        db = client.smart_recruitment
+        stats = JobStats(db.job_stats, db.candidates)
+        print(json.dumps(await stats.rebuild(args[1] if len(args) > 1 else None), indent=2))
+        return 0
+
+    sys.exit(asyncio.run(main(sys.argv[1:])))
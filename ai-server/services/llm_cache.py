@@ -0,0 +1,116 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "1") == "1"
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "llm_cache.sqlite3")
+LLM_CACHE_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1024"))
+PURGE_EVERY_WRITES = 500
+
+def cache_key(model: str, prompt: str, params: Optional[dict] = None) -> str:
+    payload = json.dumps({"model": model, "prompt": prompt, "params": params or {}}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class LLMCache:
+    # Two tiers: an in-memory LRU in front of a SQLite table, both honouring the same TTL
+    def __init__(self, path: str = LLM_CACHE_PATH, max_entries: int = LLM_CACHE_MAX_ENTRIES, ttl_seconds: float = LLM_CACHE_TTL_SECONDS, enabled: bool = LLM_CACHE_ENABLED):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self._memory = OrderedDict()  # key -> (stored_at, value)
+        self._conn = None
+        self._conn_lock = threading.Lock()
+        self._writes = 0
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0, "errors": 0}
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def _disk_get(self, key: str):
+        with self._conn_lock:
+            row = self._connection().execute(
+                "SELECT value, stored_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+        return row
+
+    def _disk_set(self, key: str, value: str, stored_at: float):
+        with self._conn_lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, stored_at) VALUES (?, ?, ?)", (key, value, stored_at)
+            )
+            self._writes += 1
+            if self._writes % PURGE_EVERY_WRITES == 0:
+                conn.execute("DELETE FROM llm_cache WHERE stored_at < ?", (time.time() - self.ttl_seconds,))
+            conn.commit()
+
+    def _remember(self, key: str, stored_at: float, value: Any):
+        self._memory[key] = (stored_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    async def get(self, key: str) -> Optional[Any]:
+        if not self.enabled:
+            return None
+        now = time.time()
+        entry = self._memory.get(key)
+        if entry and now - entry[0] < self.ttl_seconds:
+            self._memory.move_to_end(key)
+            self.stats["memory_hits"] += 1
+            return entry[1]
+        try:
+            row = await asyncio.to_thread(self._disk_get, key)
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.warning(f"LLM cache read failed: {e}")
+            row = None
+        if row and now - row[1] < self.ttl_seconds:
+            value = json.loads(row[0])
+            self._remember(key, row[1], value)
+            self.stats["disk_hits"] += 1
+            return value
+        self.stats["misses"] += 1
+        return None
+
+    async def set(self, key: str, value: Any):
+        if not self.enabled:
+            return
+        stored_at = time.time()
+        self._remember(key, stored_at, value)
+        self.stats["writes"] += 1
+        try:
+            await asyncio.to_thread(self._disk_set, key, json.dumps(value), stored_at)
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.warning(f"LLM cache write failed: {e}")
+
+    def snapshot(self) -> dict:
+        lookups = self.stats["memory_hits"] + self.stats["disk_hits"] + self.stats["misses"]
+        hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+        return {
+            **self.stats,
+            "enabled": self.enabled,
+            "memory_entries": len(self._memory),
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0
+        }
+
+llm_cache = LLMCache()
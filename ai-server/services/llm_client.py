@@ -0,0 +1,96 @@
+import logging
+import os
+from typing import Dict, Optional
+import httpx
+
+logger = logging.getLogger(__name__)
+
+GROQ_BASE_URL = os.getenv("GROQ_BASE_URL", "https://api.groq.com/openai/v1")
+GROQ_MODEL = "llama3-8b-8192"
+
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+LLM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "10"))
+LLM_KEEPALIVE_EXPIRY_SECONDS = float(os.getenv("LLM_KEEPALIVE_EXPIRY_SECONDS", "120"))
+LLM_CONNECT_TIMEOUT_SECONDS = float(os.getenv("LLM_CONNECT_TIMEOUT_SECONDS", "5"))
+LLM_HTTP2 = os.getenv("LLM_HTTP2", "true").lower() in ("1", "true", "yes")
+
+# Total request timeout per chain; longer outputs get more time. Override with LLM_TIMEOUT_<NAME>
+CHAIN_TIMEOUTS = {
+    "default": 30.0,
+    "persona": 20.0,
+    "interview": 30.0,
+    "performance": 45.0,
+    "candidate_analysis": 60.0,
+    "insights": 30.0,
+    "agent": 60.0
+}
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+class LLMClientFactory:
+    # One keep-alive connection pool shared by every chat model, so chains reuse TLS connections
+    # to the provider instead of each holding (or re-opening) their own
+    def __init__(self):
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._models: Dict[str, object] = {}
+
+    def timeout(self, name: str) -> float:
+        default = CHAIN_TIMEOUTS.get(name, CHAIN_TIMEOUTS["default"])
+        return float(os.getenv(f"LLM_TIMEOUT_{name.upper()}", str(default)))
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        if self._http_client is None or self._http_client.is_closed:
+            http2 = LLM_HTTP2 and _http2_available()
+            if LLM_HTTP2 and not http2:
+                logger.info("h2 is not installed, LLM client falls back to HTTP/1.1")
+            self._http_client = httpx.AsyncClient(
+                http2=http2,
+                limits=httpx.Limits(
+                    max_connections=LLM_MAX_CONNECTIONS,
+                    max_keepalive_connections=LLM_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=LLM_KEEPALIVE_EXPIRY_SECONDS
+                ),
+                timeout=httpx.Timeout(CHAIN_TIMEOUTS["default"], connect=LLM_CONNECT_TIMEOUT_SECONDS)
+            )
+        return self._http_client
+
+    def chat_model(self, name: str = "default"):
+        # Models are cheap wrappers; they are cached per chain so each keeps its own timeout
+        model = self._models.get(name)
+        if model is None:
+            from langchain_openai import ChatOpenAI
+
+            model = ChatOpenAI(
+                # Read lazily: the app loads .env after its imports
+                api_key=os.getenv("GROQ_API_KEY"),
+                base_url=GROQ_BASE_URL,
+                model=GROQ_MODEL,
+                timeout=self.timeout(name),
+                # Retries are handled by the shared rate limiter, which honours Retry-After
+                max_retries=0,
+                http_async_client=self.http_client
+            )
+            self._models[name] = model
+        return model
+
+    def start(self):
+        # Opened from the app lifespan so the pool exists before the first request
+        return self.http_client
+
+    async def aclose(self):
+        client, self._http_client = self._http_client, None
+        self._models.clear()
+        if client is not None:
+            await client.aclose()
+
+llm_clients = LLMClientFactory()
+
+def get_llm_clients() -> LLMClientFactory:
+    # FastAPI dependency
+    return llm_clients
@@ -0,0 +1,138 @@
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+import numpy as np
+
+from services.embedding_cache import current_embedding_query, unpack_vector
+from services.vector_index import VectorIndex
+
+logger = logging.getLogger(__name__)
+
+VECTOR_INDEX_IVF_LISTS = int(os.getenv("VECTOR_INDEX_IVF_LISTS", "0"))
+VECTOR_INDEX_NPROBE = int(os.getenv("VECTOR_INDEX_NPROBE", "8"))
+LOAD_BATCH_SIZE = 5000
+# Other worker processes write vectors too; each process polls for them at most this often
+MATCHING_REFRESH_SECONDS = float(os.getenv("MATCHING_REFRESH_SECONDS", "5"))
+# Writes can commit slightly out of timestamp order (and clocks differ between hosts); every poll
+# re-reads this window, which is harmless since adding a vector again just overwrites it
+REFRESH_OVERLAP_SECONDS = 30
+# Set on candidates and jobs whenever their resume or requirement vectors change
+VECTORS_UPDATED_FIELD = "vectors_updated_at"
+
+def vectors_updated_now() -> dict:
+    return {VECTORS_UPDATED_FIELD: datetime.now(timezone.utc)}
+
+def job_query_vector(requirement_embeddings: np.ndarray) -> np.ndarray:
+    # The semantic score is the mean cosine over requirements, which equals a dot product
+    # with the mean requirement vector, so one query vector ranks candidates for the whole job
+    return np.asarray(requirement_embeddings, dtype=np.float32).mean(axis=0)
+
+class MatchingEngine:
+    def __init__(self, jobs_collection, candidates_collection, requirement_cache):
+        self.jobs_collection = jobs_collection
+        self.candidates_collection = candidates_collection
+        self.requirement_cache = requirement_cache
+        self.candidate_index = VectorIndex(ivf_lists=VECTOR_INDEX_IVF_LISTS, nprobe=VECTOR_INDEX_NPROBE)
+        self.job_index = VectorIndex()
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+        self._refresh_lock = asyncio.Lock()
+        self._watermark: Optional[datetime] = None
+        self._refreshed_at = 0.0
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    async def ensure_loaded(self):
+        if self._loaded:
+            await self._maybe_refresh()
+            return
+        async with self._load_lock:
+            if self._loaded:
+                return
+            started = datetime.now(timezone.utc)
+            await self._load()
+            self._watermark, self._refreshed_at = started, time.monotonic()
+            self._loaded = True
+
+    async def _load_candidates(self, query: dict) -> int:
+        keys, vectors, loaded = [], [], 0
+        async for c in self.candidates_collection.find(
+            # Vectors from another model (before a rescore re-embeds them) live in a different space
+            {**query, **current_embedding_query()},
+            {"candidate_id": 1, "resume_embedding": 1}
+        ):
+            keys.append(c["candidate_id"])
+            vectors.append(unpack_vector(c["resume_embedding"]))
+            if len(keys) >= LOAD_BATCH_SIZE:
+                self.candidate_index.add_many(keys, np.vstack(vectors))
+                loaded += len(keys)
+                keys, vectors = [], []
+        if keys:
+            self.candidate_index.add_many(keys, np.vstack(vectors))
+            loaded += len(keys)
+        return loaded
+
+    async def _load(self):
+        await self._load_candidates({})
+        self.candidate_index.train()
+        async for job in self.jobs_collection.find():
+            await self.update_job(job)
+        logger.info(f"Matching index loaded: {len(self.candidate_index)} candidates, {len(self.job_index)} jobs")
+
+    async def _maybe_refresh(self):
+        if time.monotonic() - self._refreshed_at < MATCHING_REFRESH_SECONDS:
+            return
+        async with self._refresh_lock:
+            if time.monotonic() - self._refreshed_at < MATCHING_REFRESH_SECONDS:
+                return
+            try:
+                await self.refresh()
+            except Exception as e:
+                # Serve the slightly stale index rather than failing the request
+                logger.warning(f"Matching index refresh failed: {e}")
+            self._refreshed_at = time.monotonic()
+
+    async def refresh(self):
+        # Picks up vectors written by other workers since the last poll. Deletions are not seen here;
+        # callers drop hits whose documents no longer exist
+        started = datetime.now(timezone.utc)
+        since = {VECTORS_UPDATED_FIELD: {"$gt": self._watermark - timedelta(seconds=REFRESH_OVERLAP_SECONDS)}}
+        await self._load_candidates(since)
+        async for job in self.jobs_collection.find(since):
+            await self.update_job(job)
+        self._watermark = started
+
+    def add_candidate(self, candidate_id: str, embedding: np.ndarray):
+        self.candidate_index.add(candidate_id, embedding)
+
+    def remove_candidate(self, candidate_id: str):
+        self.candidate_index.remove(candidate_id)
+
+    async def update_job(self, job: dict):
+        requirement_embeddings = await self.requirement_cache.get(job)
+        if requirement_embeddings is None:
+            self.job_index.remove(job["job_id"])
+        else:
+            self.job_index.add(job["job_id"], job_query_vector(requirement_embeddings))
+
+    def remove_job(self, job_id: str):
+        self.job_index.remove(job_id)
+
+    async def match_candidates(self, job: dict, k: int, exclude: Optional[set] = None) -> List[Tuple[str, float]]:
+        await self.ensure_loaded()
+        requirement_embeddings = await self.requirement_cache.get(job)
+        if requirement_embeddings is None:
+            return []
+        return self.candidate_index.search(job_query_vector(requirement_embeddings), k, exclude)
+
+    async def match_jobs(self, candidate_id: str, k: int) -> Optional[List[Tuple[str, float]]]:
+        await self.ensure_loaded()
+        embedding = self.candidate_index.get(candidate_id)
+        if embedding is None:
+            return None
+        return self.job_index.search(embedding, k)
@@ -0,0 +1,163 @@
+import hashlib
+import logging
+import os
+import re
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+import numpy as np
+from pymongo import UpdateOne
+
+logger = logging.getLogger(__name__)
+
+MINHASH_PERMUTATIONS = int(os.getenv("MINHASH_PERMUTATIONS", "128"))
+LSH_BANDS = int(os.getenv("LSH_BANDS", "16"))
+SHINGLE_SIZE = int(os.getenv("SHINGLE_SIZE", "5"))
+NEAR_DUPLICATE_THRESHOLD = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.8"))
+# With 16 bands of 8 rows a pair at 0.7 similarity shares a band ~60% of the time, at 0.6 only ~25%;
+# below this LSH misses most pairs, so lower thresholds are not offered
+MIN_NEAR_DUPLICATE_THRESHOLD = 0.7
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_rng = np.random.RandomState(1)
+# Fixed seed: signatures are persisted, so the permutations must be identical across restarts
+_PERM_A = _rng.randint(1, (1 << 61) - 1, size=MINHASH_PERMUTATIONS, dtype=np.uint64)
+_PERM_B = _rng.randint(0, (1 << 61) - 1, size=MINHASH_PERMUTATIONS, dtype=np.uint64)
+_WORD_RE = re.compile(r"\w+")
+
+def _shingle_hashes(text: str) -> np.ndarray:
+    words = _WORD_RE.findall(text.lower())
+    shingles = {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+    return np.array(
+        [int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest(), "little") for s in shingles],
+        dtype=np.uint64
+    )
+
+def minhash_signature(text: str) -> Optional[np.ndarray]:
+    # None for (nearly) empty text, e.g. scanned PDFs: identical empty signatures would all match each other
+    hashes = _shingle_hashes(text)
+    if not len(hashes):
+        return None
+    with np.errstate(over="ignore"):
+        permuted = ((hashes[:, None] * _PERM_A + _PERM_B) % _MERSENNE_PRIME) & _MAX_HASH
+    return permuted.min(axis=0).astype(np.uint32)
+
+def pack_signature(signature: np.ndarray) -> bytes:
+    return np.asarray(signature, dtype=np.uint32).tobytes()
+
+def unpack_signature(blob: bytes) -> np.ndarray:
+    return np.frombuffer(blob, dtype=np.uint32)
+
+def band_keys(signature: np.ndarray) -> List[int]:
+    rows = len(signature) // LSH_BANDS
+    keys = []
+    for band in range(LSH_BANDS):
+        chunk = signature[band * rows:(band + 1) * rows].tobytes()
+        digest = hashlib.blake2b(chunk, digest_size=7, person=band.to_bytes(2, "little")).digest()
+        keys.append(int.from_bytes(digest, "little"))
+    return keys
+
+def estimated_jaccard(a: np.ndarray, b: np.ndarray) -> float:
+    return float(np.mean(a == b))
+
+class NearDuplicateIndex:
+    # LSH banding: resumes sharing any band bucket are candidates, then confirmed by signature agreement
+    def __init__(self):
+        self._signatures: Dict[str, np.ndarray] = {}
+        self._bands: Dict[str, List[int]] = {}
+        self._buckets: Dict[int, Set[str]] = defaultdict(set)
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def add(self, key: str, signature: np.ndarray):
+        self.remove(key)
+        keys = band_keys(signature)
+        self._signatures[key] = signature
+        self._bands[key] = keys
+        for band_key in keys:
+            self._buckets[band_key].add(key)
+
+    def remove(self, key: str):
+        for band_key in self._bands.pop(key, []):
+            bucket = self._buckets.get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band_key]
+        self._signatures.pop(key, None)
+
+    def query(self, signature: np.ndarray, threshold: float = NEAR_DUPLICATE_THRESHOLD, exclude: Optional[str] = None) -> List[Tuple[str, float]]:
+        candidates = set()
+        for band_key in band_keys(signature):
+            candidates.update(self._buckets.get(band_key, ()))
+        candidates.discard(exclude)
+        matches = []
+        for key in candidates:
+            similarity = estimated_jaccard(signature, self._signatures[key])
+            if similarity >= threshold:
+                matches.append((key, round(similarity, 4)))
+        return sorted(matches, key=lambda m: m[1], reverse=True)
+
+    def clusters(self, threshold: float = NEAR_DUPLICATE_THRESHOLD) -> List[List[str]]:
+        parent = {key: key for key in self._signatures}
+
+        def find(key):
+            while parent[key] != key:
+                parent[key] = parent[parent[key]]
+                key = parent[key]
+            return key
+
+        for key, signature in self._signatures.items():
+            for other, _ in self.query(signature, threshold, exclude=key):
+                root_a, root_b = find(key), find(other)
+                if root_a != root_b:
+                    parent[root_b] = root_a
+        groups = defaultdict(list)
+        for key in self._signatures:
+            groups[find(key)].append(key)
+        return [sorted(group) for group in groups.values() if len(group) > 1]
+
+def is_empty_signature(signature: np.ndarray) -> bool:
+    # What minhash_signature used to return for empty text
+    return bool(np.all(signature == _MAX_HASH))
+
+class NearDuplicateDetector:
+    # Band keys live on the candidate documents (indexed `lsh_bands`), so every worker process sees
+    # resumes handled by the others
+    def __init__(self, candidates_collection):
+        self.candidates_collection = candidates_collection
+
+    async def backfill_bands(self):
+        # Candidates signed before band keys were stored; empty-text signatures are dropped
+        operations = []
+        async for c in self.candidates_collection.find(
+            {"minhash": {"$exists": True}, "lsh_bands": {"$exists": False}}, {"minhash": 1}
+        ):
+            signature = unpack_signature(c["minhash"])
+            if is_empty_signature(signature):
+                operations.append(UpdateOne({"_id": c["_id"]}, {"$unset": {"minhash": "", "near_duplicate_of": ""}}))
+            else:
+                operations.append(UpdateOne({"_id": c["_id"]}, {"$set": {"lsh_bands": band_keys(signature)}}))
+        if operations:
+            await self.candidates_collection.bulk_write(operations, ordered=False)
+            logger.info(f"Stored LSH band keys for {len(operations)} candidates")
+
+    async def check_and_add(self, candidate_id: str, resume_text: str) -> List[Tuple[str, float]]:
+        signature = minhash_signature(resume_text)
+        if signature is None:
+            return []
+        keys = band_keys(signature)
+        # Written before querying, so two near-duplicates processed at the same time still find each other
+        await self.candidates_collection.update_one(
+            {"candidate_id": candidate_id},
+            {"$set": {"minhash": pack_signature(signature), "lsh_bands": keys}}
+        )
+        matches = []
+        async for c in self.candidates_collection.find(
+            {"lsh_bands": {"$in": keys}, "candidate_id": {"$ne": candidate_id}}, {"candidate_id": 1, "minhash": 1}
+        ):
+            similarity = estimated_jaccard(signature, unpack_signature(c["minhash"]))
+            if similarity >= NEAR_DUPLICATE_THRESHOLD:
+                matches.append((c["candidate_id"], round(similarity, 4)))
+        return sorted(matches, key=lambda m: m[1], reverse=True)
@@ -0,0 +1,236 @@
+import asyncio
+import io
+import logging
+import multiprocessing
+import os
+import signal
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Optional, Set, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+PDF_EXTRACT_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS", str(max(1, (os.cpu_count() or 2) - 1))))
+PDF_EXTRACT_MAX_QUEUE = int(os.getenv("PDF_EXTRACT_MAX_QUEUE", str(PDF_EXTRACT_WORKERS * 4)))
+PDF_EXTRACT_TIMEOUT_SECONDS = float(os.getenv("PDF_EXTRACT_TIMEOUT_SECONDS", "30"))
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "30"))
+PDF_MAX_BYTES = int(os.getenv("PDF_MAX_BYTES", str(20 * 1024 * 1024)))
+# Fast backend tried first; pdfplumber is only used when it fails or returns empty/garbled text
+PDF_EXTRACT_BACKEND = os.getenv("PDF_EXTRACT_BACKEND", "pypdfium2")
+FALLBACK_BACKEND = "pdfplumber"
+
+class PdfExtractionError(Exception):
+    pass
+
+class _ExtractionTimeout(Exception):
+    pass
+
+def _on_alarm(signum, frame):
+    raise _ExtractionTimeout()
+
+def _as_file(source: Union[str, bytes]):
+    return io.BytesIO(source) if isinstance(source, bytes) else source
+
+def extract_with_pypdfium2(source: Union[str, bytes], max_pages: int) -> str:
+    import pypdfium2 as pdfium
+
+    pdf = pdfium.PdfDocument(source)
+    try:
+        texts = []
+        for i in range(min(len(pdf), max_pages)):
+            page = pdf[i]
+            textpage = page.get_textpage()
+            texts.append(textpage.get_text_range())
+            textpage.close()
+            page.close()
+        return "\n".join(texts)
+    finally:
+        pdf.close()
+
+def extract_with_pdfminer(source: Union[str, bytes], max_pages: int) -> str:
+    from pdfminer.high_level import extract_text
+
+    # laparams=None skips layout analysis, which is most of pdfminer's cost
+    return extract_text(_as_file(source), maxpages=max_pages, laparams=None)
+
+def extract_with_pdfplumber(source: Union[str, bytes], max_pages: int) -> str:
+    import pdfplumber
+
+    with pdfplumber.open(_as_file(source)) as pdf:
+        return "\n".join([page.extract_text() or "" for page in pdf.pages[:max_pages]])
+
+EXTRACTOR_BACKENDS: Dict[str, Callable[[Union[str, bytes], int], str]] = {
+    "pypdfium2": extract_with_pypdfium2,
+    "pdfminer": extract_with_pdfminer,
+    "pdfplumber": extract_with_pdfplumber
+}
+
+def register_backend(name: str, extractor: Callable[[Union[str, bytes], int], str]):
+    EXTRACTOR_BACKENDS[name] = extractor
+
+def looks_garbled(text: str) -> bool:
+    stripped = text.strip()
+    if len(stripped) < 20:
+        return True
+    # Unmapped glyphs come out as "(cid:NN)" or U+FFFD; real resumes are mostly letters and spaces
+    if stripped.count("(cid:") > 5 or stripped.count("\ufffd") > len(stripped) * 0.01:
+        return True
+    readable = sum(1 for ch in stripped if ch.isalnum() or ch.isspace() or ch in ".,;:-()/@+&'\"")
+    return readable / len(stripped) < 0.85
+
+def extract_text(source: Union[str, bytes], max_pages: int, backend: str = PDF_EXTRACT_BACKEND) -> Tuple[str, str]:
+    # Returns (text, backend that produced it)
+    if backend != FALLBACK_BACKEND and backend in EXTRACTOR_BACKENDS:
+        try:
+            text = EXTRACTOR_BACKENDS[backend](source, max_pages)
+            if not looks_garbled(text):
+                return text, backend
+        except ImportError:
+            logger.warning(f"PDF backend {backend} is not installed, using {FALLBACK_BACKEND}")
+        except _ExtractionTimeout:
+            raise
+        except Exception as e:
+            logger.info(f"PDF backend {backend} failed, falling back to {FALLBACK_BACKEND}: {e}")
+    return EXTRACTOR_BACKENDS[FALLBACK_BACKEND](source, max_pages), FALLBACK_BACKEND
+
+def _extract_text(source: Union[str, bytes], max_pages: int, timeout_seconds: float, backend: str) -> Tuple[str, str]:
+    # Runs inside a pool process. SIGALRM interrupts a document that runs past its budget
+    # without taking the whole worker down.
+    signal.signal(signal.SIGALRM, _on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, timeout_seconds)
+    try:
+        return extract_text(source, max_pages, backend)
+    except _ExtractionTimeout:
+        raise PdfExtractionError(f"PDF extraction timed out after {timeout_seconds:.0f}s")
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+
+class PdfExtractor:
+    # Runs extraction in a bounded process pool so CPU-heavy parsing never blocks the event loop
+    def __init__(
+        self,
+        workers: int = PDF_EXTRACT_WORKERS,
+        max_queue: int = PDF_EXTRACT_MAX_QUEUE,
+        timeout_seconds: float = PDF_EXTRACT_TIMEOUT_SECONDS,
+        max_pages: int = PDF_MAX_PAGES,
+        max_bytes: int = PDF_MAX_BYTES,
+        backend: str = PDF_EXTRACT_BACKEND
+    ):
+        self.workers = workers
+        self.backend = backend
+        self.timeout_seconds = timeout_seconds
+        self.max_pages = max_pages
+        self.max_bytes = max_bytes
+        self._pool: Optional[ProcessPoolExecutor] = None
+        # Jobs submitted to the current pool, and jobs whose pool was reset under them
+        self._pool_jobs: Set[Future] = set()
+        self._orphaned: Set[Future] = set()
+        self._slots = asyncio.Semaphore(max_queue)
+        self.stats = {
+            "waiting": 0,
+            "in_flight": 0,
+            "completed": 0,
+            "failed": 0,
+            "timeouts": 0,
+            "rejected": 0,
+            "retried": 0,
+            "total_seconds": 0.0,
+            "max_seconds": 0.0,
+            "backends": {}
+        }
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # forkserver keeps children from inheriting the server's loaded models and threads
+            context = multiprocessing.get_context("forkserver")
+            context.set_forkserver_preload(["services.pdf_extraction"])
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+        return self._pool
+
+    def _reset_pool(self, failed_pool: Optional[ProcessPoolExecutor] = None):
+        # A sibling job may already have replaced the pool its job ran on
+        if failed_pool is not None and failed_pool is not self._pool:
+            return
+        pool, self._pool = self._pool, None
+        if pool is None:
+            return
+        # Other jobs on the old pool are cancelled with it; extract() retries them on the new one
+        self._orphaned |= self._pool_jobs
+        self._pool_jobs = set()
+        processes = list((pool._processes or {}).values())
+        pool.shutdown(wait=False, cancel_futures=True)
+        # shutdown() does not stop a worker stuck in C code, which SIGALRM cannot interrupt either
+        for process in processes:
+            process.terminate()
+
+    def shutdown(self):
+        self._reset_pool()
+
+    def _check_size(self, source: Union[str, bytes]):
+        size = len(source) if isinstance(source, bytes) else os.path.getsize(source)
+        if size > self.max_bytes:
+            self.stats["rejected"] += 1
+            raise PdfExtractionError(f"PDF is {size} bytes, the limit is {self.max_bytes}")
+
+    async def extract(self, source: Union[str, bytes]) -> str:
+        self._check_size(source)
+        self.stats["waiting"] += 1
+        async with self._slots:
+            self.stats["waiting"] -= 1
+            self.stats["in_flight"] += 1
+            started = time.perf_counter()
+            try:
+                text, used_backend = await self._run(source)
+            finally:
+                self.stats["in_flight"] -= 1
+            elapsed = time.perf_counter() - started
+            self.stats["completed"] += 1
+            self.stats["total_seconds"] += elapsed
+            self.stats["max_seconds"] = max(self.stats["max_seconds"], elapsed)
+            self.stats["backends"][used_backend] = self.stats["backends"].get(used_backend, 0) + 1
+            return text
+
+    async def _run(self, source: Union[str, bytes]) -> Tuple[str, str]:
+        # A job that only failed because another job reset the pool gets one more try on the new pool
+        for attempt in range(2):
+            pool = self._get_pool()
+            job = pool.submit(_extract_text, source, self.max_pages, self.timeout_seconds, self.backend)
+            self._pool_jobs.add(job)
+            try:
+                # The in-process alarm should fire first; this outer guard catches a wedged worker
+                return await asyncio.wait_for(asyncio.wrap_future(job), timeout=self.timeout_seconds + 5)
+            except asyncio.TimeoutError:
+                self.stats["timeouts"] += 1
+                self._reset_pool(pool)
+                raise PdfExtractionError(f"PDF extraction timed out after {self.timeout_seconds:.0f}s")
+            except (asyncio.CancelledError, BrokenProcessPool) as e:
+                if job not in self._orphaned:
+                    if isinstance(e, asyncio.CancelledError):
+                        raise
+                    self.stats["failed"] += 1
+                    self._reset_pool(pool)
+                    raise PdfExtractionError(f"PDF extraction worker crashed: {e}")
+                if attempt:
+                    self.stats["failed"] += 1
+                    raise PdfExtractionError("PDF extraction was interrupted by a worker pool reset")
+                self.stats["retried"] += 1
+            except PdfExtractionError:
+                self.stats["timeouts"] += 1
+                raise
+            except Exception as e:
+                self.stats["failed"] += 1
+                raise PdfExtractionError(str(e))
+            finally:
+                self._pool_jobs.discard(job)
+                self._orphaned.discard(job)
+
+    def snapshot(self) -> dict:
+        completed = self.stats["completed"]
+        return {
+            **self.stats,
+            "queue_depth": self.stats["waiting"] + self.stats["in_flight"],
+            "avg_seconds": round(self.stats["total_seconds"] / completed, 4) if completed else 0.0
+        }
+
+pdf_extractor = PdfExtractor()
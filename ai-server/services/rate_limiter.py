@@ -0,0 +1,172 @@
+import asyncio
+import logging
+import os
+import random
+import time
+from contextvars import ContextVar
+from typing import AsyncIterator, Awaitable, Callable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+LLM_REQUESTS_PER_MINUTE = float(os.getenv("LLM_REQUESTS_PER_MINUTE", "30"))
+LLM_TOKENS_PER_MINUTE = float(os.getenv("LLM_TOKENS_PER_MINUTE", "30000"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "5"))
+LLM_BACKOFF_BASE = float(os.getenv("LLM_BACKOFF_BASE", "1.0"))
+LLM_BACKOFF_MAX = float(os.getenv("LLM_BACKOFF_MAX", "60.0"))
+
+# Set while a coroutine holds a concurrency slot, so nested calls (agent -> tool -> chain)
+# reuse it instead of deadlocking on the semaphore
+_holding_slot: ContextVar[bool] = ContextVar("llm_limiter_holding_slot", default=False)
+
+def estimate_tokens(text: str) -> int:
+    # Rough heuristic (~4 characters per token) used until the provider reports real usage
+    return len(text) // 4 + 1
+
+class TokenBucket:
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.tokens = per_minute
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float):
+        # Requests larger than the bucket are admitted once it is full, otherwise they would wait forever
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+    def adjust(self, delta: float):
+        # Positive delta charges extra usage, negative refunds an over-estimate
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens - delta)
+
+def _retry_after_seconds(error: Exception) -> Optional[float]:
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000
+        except ValueError:
+            pass
+    retry_after = headers.get("retry-after")
+    if retry_after:
+        try:
+            return float(retry_after)
+        except ValueError:
+            pass
+    return None
+
+def _is_rate_limited(error: Exception) -> bool:
+    status = getattr(error, "status_code", None) or getattr(getattr(error, "response", None), "status_code", None)
+    return status == 429 or type(error).__name__ == "RateLimitError"
+
+class RateLimiter:
+    def __init__(
+        self,
+        requests_per_minute: float = LLM_REQUESTS_PER_MINUTE,
+        tokens_per_minute: float = LLM_TOKENS_PER_MINUTE,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        max_retries: int = LLM_MAX_RETRIES,
+        backoff_base: float = LLM_BACKOFF_BASE,
+        backoff_max: float = LLM_BACKOFF_MAX
+    ):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._paused_until = 0.0
+        self.stats = {"calls": 0, "rate_limited": 0, "retries": 0, "in_flight": 0}
+
+    async def _wait_if_paused(self):
+        # A 429 pauses every caller, not just the one that received it
+        delay = self._paused_until - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: Optional[int]):
+        if actual_tokens is not None:
+            self.tokens.adjust(actual_tokens - estimated_tokens)
+
+    async def _attempt(self, call: Callable[[], Awaitable[T]], estimated_tokens: int) -> T:
+        await self._wait_if_paused()
+        await self.requests.acquire(1)
+        if estimated_tokens:
+            await self.tokens.acquire(estimated_tokens)
+        self.stats["calls"] += 1
+        return await call()
+
+    async def run(self, call: Callable[[], Awaitable[T]], estimated_tokens: int = 0) -> T:
+        attempt = 0
+        while True:
+            await self._wait_if_paused()
+            try:
+                if _holding_slot.get():
+                    return await self._attempt(call, estimated_tokens)
+                async with self._slots:
+                    token = _holding_slot.set(True)
+                    self.stats["in_flight"] += 1
+                    try:
+                        return await self._attempt(call, estimated_tokens)
+                    finally:
+                        self.stats["in_flight"] -= 1
+                        _holding_slot.reset(token)
+            except Exception as e:
+                if not _is_rate_limited(e) or attempt >= self.max_retries:
+                    raise
+                self._back_off(e, attempt)
+                attempt += 1
+
+    async def stream(self, open_stream: Callable[[], AsyncIterator[T]], estimated_tokens: int = 0) -> AsyncIterator[T]:
+        # The slot is held until the last chunk; a 429 can only be retried before anything was yielded
+        attempt = 0
+        while True:
+            await self._wait_if_paused()
+            started = False
+            try:
+                async with self._slots:
+                    self.stats["in_flight"] += 1
+                    try:
+                        await self.requests.acquire(1)
+                        if estimated_tokens:
+                            await self.tokens.acquire(estimated_tokens)
+                        self.stats["calls"] += 1
+                        async for chunk in open_stream():
+                            started = True
+                            yield chunk
+                    finally:
+                        self.stats["in_flight"] -= 1
+                return
+            except Exception as e:
+                if started or not _is_rate_limited(e) or attempt >= self.max_retries:
+                    raise
+                self._back_off(e, attempt)
+                attempt += 1
+
+    def _back_off(self, error: Exception, attempt: int):
+        self.stats["rate_limited"] += 1
+        self.stats["retries"] += 1
+        delay = _retry_after_seconds(error)
+        if delay is None:
+            delay = min(self.backoff_max, self.backoff_base * (2 ** attempt)) * (0.5 + random.random() / 2)
+        self._paused_until = max(self._paused_until, time.monotonic() + delay)
+        logger.warning(f"LLM rate limited, retrying in {delay:.1f}s (attempt {attempt + 1}/{self.max_retries})")
+
+llm_limiter = RateLimiter()
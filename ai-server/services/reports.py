@@ -0,0 +1,53 @@
+import math
+from typing import List, Optional
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import OperationFailure
+
+PERCENTILES = [0.25, 0.5, 0.75, 0.9]
+_SCORED = {"score": {"$type": "number"}}
+
+# Counts, averages and the histogram come from the job_stats counters; order statistics cannot be
+# maintained with $inc, so they are computed here over the (job_id, score) index
+
+async def _score_at(candidates_collection, job_id: str, direction: int, skip: int = 0) -> Optional[float]:
+    docs = await candidates_collection.find(
+        {"job_id": job_id, **_SCORED}, {"_id": 0, "score": 1}
+    ).sort("score", direction).skip(skip).limit(1).to_list(length=1)
+    return docs[0]["score"] if docs else None
+
+async def _percentiles_by_rank(candidates_collection, job_id: str, scored: int) -> List[Optional[float]]:
+    # Fallback for MongoDB < 7.0 (no $percentile): nearest-rank lookups walk the index
+    return [
+        await _score_at(candidates_collection, job_id, ASCENDING, max(0, math.ceil(p * scored) - 1))
+        for p in PERCENTILES
+    ]
+
+async def job_score_distribution(candidates_collection, job_id: str, scored: int) -> dict:
+    if not scored:
+        min_score, max_score, values = None, None, [None] * len(PERCENTILES)
+    else:
+        try:
+            result = await candidates_collection.aggregate([
+                {"$match": {"job_id": job_id, **_SCORED}},
+                {"$group": {
+                    "_id": None,
+                    "minScore": {"$min": "$score"},
+                    "maxScore": {"$max": "$score"},
+                    "values": {"$percentile": {"input": "$score", "p": PERCENTILES, "method": "approximate"}}
+                }}
+            ]).to_list(length=1)
+            row = result[0] if result else {}
+            min_score, max_score = row.get("minScore"), row.get("maxScore")
+            values = row.get("values") or [None] * len(PERCENTILES)
+        except OperationFailure:
+            min_score = await _score_at(candidates_collection, job_id, ASCENDING)
+            max_score = await _score_at(candidates_collection, job_id, DESCENDING)
+            values = await _percentiles_by_rank(candidates_collection, job_id, scored)
+    return {
+        "minScore": min_score,
+        "maxScore": max_score,
+        "scorePercentiles": {
+            f"p{int(p * 100)}": round(value, 2) if value is not None else None
+            for p, value in zip(PERCENTILES, values)
+        }
+    }
@@ -0,0 +1,169 @@
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Optional
+from uuid import uuid4
+from pymongo import ReturnDocument
+
+logger = logging.getLogger(__name__)
+
+PROCESSING_WORKERS = int(os.getenv("PROCESSING_WORKERS", "2"))
+PROCESSING_MAX_ATTEMPTS = int(os.getenv("PROCESSING_MAX_ATTEMPTS", "3"))
+PROCESSING_LEASE_SECONDS = float(os.getenv("PROCESSING_LEASE_SECONDS", "600"))
+PROCESSING_RETRY_DELAY_SECONDS = float(os.getenv("PROCESSING_RETRY_DELAY_SECONDS", "10"))
+PROCESSING_POLL_INTERVAL_SECONDS = float(os.getenv("PROCESSING_POLL_INTERVAL_SECONDS", "2"))
+
+class PermanentTaskError(Exception):
+    # Raised by a handler for failures that would repeat on every attempt; the task is dead-lettered at once
+    pass
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+class ResumeQueue:
+    # Durable work queue stored in a Mongo collection. Workers claim tasks with a lease, so a task
+    # held by a crashed process becomes claimable again once its lease expires.
+    def __init__(
+        self,
+        collection,
+        handler: Callable[[dict], Awaitable[Optional[dict]]],
+        on_dead_letter: Callable[[dict, Exception], Awaitable[None]],
+        workers: int = PROCESSING_WORKERS,
+        max_attempts: int = PROCESSING_MAX_ATTEMPTS,
+        lease_seconds: float = PROCESSING_LEASE_SECONDS,
+        retry_delay_seconds: float = PROCESSING_RETRY_DELAY_SECONDS,
+        poll_interval_seconds: float = PROCESSING_POLL_INTERVAL_SECONDS
+    ):
+        self.collection = collection
+        self.handler = handler
+        self.on_dead_letter = on_dead_letter
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self.retry_delay_seconds = retry_delay_seconds
+        self.poll_interval_seconds = poll_interval_seconds
+        self._tasks = []
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+
+    async def enqueue(self, payload: dict, processing_id: Optional[str] = None) -> str:
+        processing_id = processing_id or str(uuid4())
+        now = _now()
+        await self.collection.insert_one({
+            "_id": processing_id,
+            "status": "queued",
+            "attempts": 0,
+            "payload": payload,
+            "error": None,
+            "available_at": now,
+            "created_at": now,
+            "updated_at": now
+        })
+        self._wakeup.set()
+        return processing_id
+
+    async def get(self, processing_id: str) -> Optional[dict]:
+        return await self.collection.find_one({"_id": processing_id})
+
+    async def depth(self) -> dict:
+        counts = {}
+        async for row in self.collection.aggregate([{"$group": {"_id": "$status", "count": {"$sum": 1}}}]):
+            counts[row["_id"]] = row["count"]
+        return counts
+
+    def start(self):
+        self._stopping = False
+        for n in range(self.workers):
+            self._tasks.append(asyncio.create_task(self._worker(n)))
+
+    async def stop(self):
+        self._stopping = True
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _claim(self) -> Optional[dict]:
+        now = _now()
+        return await self.collection.find_one_and_update(
+            {"$or": [
+                {"status": "queued", "available_at": {"$lte": now}},
+                {"status": "running", "lease_expires_at": {"$lte": now}}
+            ]},
+            {
+                "$set": {
+                    "status": "running",
+                    "lease_expires_at": now + timedelta(seconds=self.lease_seconds),
+                    "updated_at": now
+                },
+                "$inc": {"attempts": 1}
+            },
+            sort=[("available_at", 1)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def _wait_for_work(self):
+        self._wakeup.clear()
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval_seconds)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _worker(self, n: int):
+        while True:
+            try:
+                task = await self._claim()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Processing worker {n} failed to claim a task: {e}")
+                await asyncio.sleep(self.poll_interval_seconds)
+                continue
+            if task is None:
+                await self._wait_for_work()
+                continue
+            try:
+                await self._run(task)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Recording the outcome failed (e.g. Mongo unreachable); the lease makes the task claimable again
+                logger.warning(f"Processing worker {n} failed to record task {task['_id']}: {e}")
+
+    async def _run(self, task: dict):
+        try:
+            result = await self.handler(task)
+        except asyncio.CancelledError as e:
+            if self._stopping:
+                raise
+            # A cancellation that did not come from stop() is a failed attempt, not a reason for the worker to exit
+            await self._fail(task, RuntimeError(f"Processing was cancelled: {e}"))
+            return
+        except Exception as e:
+            await self._fail(task, e)
+            return
+        await self.collection.update_one(
+            {"_id": task["_id"]},
+            {"$set": {"status": "done", "error": None, "result": result, "updated_at": _now()}}
+        )
+
+    async def _fail(self, task: dict, error: Exception):
+        logger.error(f"Processing task {task['_id']} failed (attempt {task['attempts']}): {error}", exc_info=error)
+        if task["attempts"] >= self.max_attempts or isinstance(error, PermanentTaskError):
+            await self.collection.update_one(
+                {"_id": task["_id"]},
+                {"$set": {"status": "dead", "error": str(error), "updated_at": _now()}}
+            )
+            await self.on_dead_letter(task, error)
+        else:
+            delay = self.retry_delay_seconds * (2 ** (task["attempts"] - 1))
+            await self.collection.update_one(
+                {"_id": task["_id"]},
+                {"$set": {
+                    "status": "queued",
+                    "error": str(error),
+                    "available_at": _now() + timedelta(seconds=delay),
+                    "updated_at": _now()
+                }}
+            )
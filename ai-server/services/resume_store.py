@@ -0,0 +1,142 @@
+import asyncio
+import hashlib
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, Optional
+import numpy as np
+
+from services.embedding_cache import current_embedding_query, current_resume_embedding, resume_embedding_fields
+
+logger = logging.getLogger(__name__)
+
+HASH_CHUNK_BYTES = 1024 * 1024
+
+def file_sha256(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def normalize_resume_text(text: str) -> str:
+    return " ".join(text.split()).lower()
+
+def text_sha256(text: str) -> str:
+    return hashlib.sha256(normalize_resume_text(text).encode("utf-8")).hexdigest()
+
+@dataclass
+class ResumeArtifacts:
+    file_hash: str
+    text_hash: str
+    resume_text: str
+    embedding: Optional[np.ndarray]
+    reused: bool
+
+class ResumeStore:
+    # Job-independent artifacts of a resume (extracted text and embedding), keyed by the SHA-256 of
+    # the file bytes, with a secondary lookup by the hash of the normalised text
+    def __init__(
+        self,
+        collection,
+        extract: Callable[[str], Awaitable[str]],
+        embed: Callable[[str], Awaitable[np.ndarray]]
+    ):
+        self.collection = collection
+        self.extract = extract
+        self.embed = embed
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.stats = {"file_hits": 0, "text_hits": 0, "misses": 0, "coalesced": 0}
+
+    async def resolve(self, file_path: str, embed: bool = True) -> ResumeArtifacts:
+        file_hash = await asyncio.to_thread(file_sha256, file_path)
+        # Concurrent uploads of the same bytes wait for the first one instead of redoing the work
+        inflight = self._inflight.get(file_hash)
+        if inflight is not None:
+            self.stats["coalesced"] += 1
+            try:
+                artifacts = await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+                # The first caller was cancelled before finishing; do the work here instead
+                return await self.resolve(file_path, embed)
+            if embed and artifacts.embedding is None:
+                return await self._ensure_embedding(artifacts)
+            return artifacts
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[file_hash] = future
+        try:
+            artifacts = await self._resolve(file_hash, file_path, embed)
+            future.set_result(artifacts)
+            return artifacts
+        except Exception as e:
+            future.set_exception(e)
+            # Nobody else may be waiting; mark the exception as retrieved
+            future.exception()
+            raise
+        finally:
+            # Cancelled (or interrupted some other way): never leave waiters hanging on the future
+            if not future.done():
+                future.cancel()
+            self._inflight.pop(file_hash, None)
+
+    async def _resolve(self, file_hash: str, file_path: str, embed: bool) -> ResumeArtifacts:
+        doc = await self.collection.find_one({"_id": file_hash})
+        if doc:
+            self.stats["file_hits"] += 1
+            artifacts = ResumeArtifacts(
+                file_hash=file_hash,
+                text_hash=doc["text_sha256"],
+                resume_text=doc["resume_text"],
+                embedding=current_resume_embedding(doc),
+                reused=True
+            )
+        else:
+            resume_text = await self.extract(file_path)
+            text_hash = text_sha256(resume_text)
+            # A different file with the same text (re-exported PDF) can still reuse the embedding
+            same_text = await self.collection.find_one(
+                {"text_sha256": text_hash, **current_embedding_query()}, {"resume_embedding": 1, "embedding_model": 1}
+            )
+            if same_text:
+                self.stats["text_hits"] += 1
+            else:
+                self.stats["misses"] += 1
+            artifacts = ResumeArtifacts(
+                file_hash=file_hash,
+                text_hash=text_hash,
+                resume_text=resume_text,
+                embedding=current_resume_embedding(same_text) if same_text else None,
+                reused=bool(same_text)
+            )
+            await self._save(artifacts)
+        if embed and artifacts.embedding is None:
+            return await self._ensure_embedding(artifacts)
+        return artifacts
+
+    async def _ensure_embedding(self, artifacts: ResumeArtifacts) -> ResumeArtifacts:
+        artifacts.embedding = await self.embed(artifacts.resume_text)
+        await self.save_embedding(artifacts)
+        return artifacts
+
+    async def _save(self, artifacts: ResumeArtifacts):
+        fields = {
+            "text_sha256": artifacts.text_hash,
+            "resume_text": artifacts.resume_text,
+            "updated_at": datetime.now(timezone.utc)
+        }
+        if artifacts.embedding is not None:
+            fields.update(resume_embedding_fields(artifacts.embedding))
+        await self.collection.update_one(
+            {"_id": artifacts.file_hash},
+            {"$set": fields, "$setOnInsert": {"created_at": datetime.now(timezone.utc)}},
+            upsert=True
+        )
+
+    async def save_embedding(self, artifacts: ResumeArtifacts):
+        await self.collection.update_one(
+            {"_id": artifacts.file_hash},
+            {"$set": resume_embedding_fields(artifacts.embedding)}
+        )
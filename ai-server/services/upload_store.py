@@ -0,0 +1,53 @@
+import logging
+import os
+from uuid import uuid4
+
+import motor.motor_asyncio
+from gridfs.errors import NoFile
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_BUCKET = "resume_uploads"
+
+class UploadMissingError(Exception):
+    pass
+
+class UploadStore:
+    # Uploaded PDFs waiting in the processing queue, kept in GridFS so any worker on any host can claim
+    # the task. The accepting process's local copy is only a shortcut for when it also runs the task.
+    def __init__(self, db, upload_dir: str, bucket_name: str = UPLOAD_BUCKET):
+        self.bucket = motor.motor_asyncio.AsyncIOMotorGridFSBucket(db, bucket_name=bucket_name)
+        self.upload_dir = upload_dir
+
+    async def put(self, upload_id: str, file_path: str):
+        with open(file_path, "rb") as source:
+            await self.bucket.upload_from_stream_with_id(upload_id, os.path.basename(file_path), source)
+
+    async def local_path(self, upload_id: str, file_path: str) -> str:
+        # file_path is where the accepting process spooled the upload; elsewhere it is fetched from GridFS
+        if os.path.exists(file_path):
+            return file_path
+        os.makedirs(self.upload_dir, exist_ok=True)
+        local_path = os.path.join(self.upload_dir, f"{upload_id}.pdf")
+        if os.path.exists(local_path):
+            return local_path
+        # Written under a temporary name so a half-downloaded file is never mistaken for the upload
+        partial_path = f"{local_path}.{uuid4().hex}.part"
+        try:
+            with open(partial_path, "wb") as destination:
+                await self.bucket.download_to_stream(upload_id, destination)
+            os.replace(partial_path, local_path)
+        except NoFile:
+            raise UploadMissingError(f"Upload {upload_id} is missing")
+        finally:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+        return local_path
+
+    async def delete(self, upload_id: str):
+        try:
+            await self.bucket.delete(upload_id)
+        except NoFile:
+            pass
+        except Exception as e:
+            logger.error(f"Failed to delete upload {upload_id}: {e}")
@@ -0,0 +1,129 @@
+from typing import Dict, Hashable, List, Optional, Tuple
+import numpy as np
+
+# In-memory inner-product index. Brute force by default; with ivf_lists > 0 the rows are
+# partitioned into k-means lists after train() and a search only scans the nprobe closest lists.
+class VectorIndex:
+    def __init__(self, ivf_lists: int = 0, nprobe: int = 8):
+        self.ivf_lists = ivf_lists
+        self.nprobe = nprobe
+        self._vectors: Optional[np.ndarray] = None
+        self._assignments: Optional[np.ndarray] = None
+        self._centroids: Optional[np.ndarray] = None
+        self._keys: List[Hashable] = []
+        self._positions: Dict[Hashable, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key) -> bool:
+        return key in self._positions
+
+    def _reserve(self, dim: int, extra: int):
+        size = len(self._keys)
+        if self._vectors is None:
+            capacity = max(1024, extra)
+            self._vectors = np.zeros((capacity, dim), dtype=np.float32)
+            self._assignments = np.full(capacity, -1, dtype=np.int32)
+        elif size + extra > self._vectors.shape[0]:
+            capacity = max(self._vectors.shape[0] * 2, size + extra)
+            vectors = np.zeros((capacity, dim), dtype=np.float32)
+            vectors[:size] = self._vectors[:size]
+            assignments = np.full(capacity, -1, dtype=np.int32)
+            assignments[:size] = self._assignments[:size]
+            self._vectors, self._assignments = vectors, assignments
+
+    def _assign(self, vectors: np.ndarray) -> np.ndarray:
+        if self._centroids is None:
+            return np.full(len(vectors), -1, dtype=np.int32)
+        return np.argmax(vectors @ self._centroids.T, axis=1).astype(np.int32)
+
+    def add(self, key, vector: np.ndarray):
+        self.add_many([key], np.asarray(vector, dtype=np.float32).reshape(1, -1))
+
+    def add_many(self, keys: List[Hashable], vectors: np.ndarray):
+        if not len(keys):
+            return
+        vectors = np.asarray(vectors, dtype=np.float32)
+        self._reserve(vectors.shape[1], len(keys))
+        assignments = self._assign(vectors)
+        for key, vector, assignment in zip(keys, vectors, assignments):
+            row = self._positions.get(key)
+            if row is None:
+                row = len(self._keys)
+                self._keys.append(key)
+                self._positions[key] = row
+            self._vectors[row] = vector
+            self._assignments[row] = assignment
+
+    def remove(self, key):
+        row = self._positions.pop(key, None)
+        if row is None:
+            return
+        last = len(self._keys) - 1
+        if row != last:
+            # Move the last row into the hole so storage stays contiguous
+            last_key = self._keys[last]
+            self._vectors[row] = self._vectors[last]
+            self._assignments[row] = self._assignments[last]
+            self._keys[row] = last_key
+            self._positions[last_key] = row
+        self._keys.pop()
+
+    def get(self, key) -> Optional[np.ndarray]:
+        row = self._positions.get(key)
+        return None if row is None else self._vectors[row].copy()
+
+    def train(self, iterations: int = 10, sample_size: int = 20000, seed: int = 0):
+        size = len(self._keys)
+        # Partitioning only pays off once each list holds a reasonable number of rows
+        if self.ivf_lists <= 0 or size < self.ivf_lists * 40:
+            self._centroids = None
+            if self._assignments is not None:
+                self._assignments[:size] = -1
+            return
+        rng = np.random.default_rng(seed)
+        data = self._vectors[:size]
+        sample = data[rng.choice(size, size=min(size, sample_size), replace=False)]
+        centroids = sample[rng.choice(len(sample), size=self.ivf_lists, replace=False)].copy()
+        for _ in range(iterations):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            for i in range(self.ivf_lists):
+                members = sample[labels == i]
+                if len(members):
+                    centroid = members.mean(axis=0)
+                    norm = np.linalg.norm(centroid)
+                    centroids[i] = centroid / norm if norm else centroid
+        self._centroids = centroids
+        for start in range(0, size, 65536):
+            self._assignments[start:start + 65536] = self._assign(data[start:start + 65536])
+
+    def search(self, query: np.ndarray, k: int = 10, exclude=None) -> List[Tuple[Hashable, float]]:
+        size = len(self._keys)
+        if not size or k <= 0:
+            return []
+        query = np.asarray(query, dtype=np.float32).reshape(-1)
+        if self._centroids is not None:
+            probe = np.argsort(-(self._centroids @ query))[:self.nprobe]
+            rows = np.flatnonzero(np.isin(self._assignments[:size], probe))
+            scores = self._vectors[rows] @ query
+        else:
+            rows = None
+            scores = self._vectors[:size] @ query
+
+        wanted = k + (len(exclude) if exclude else 0)
+        if wanted < len(scores):
+            top = np.argpartition(-scores, wanted)[:wanted]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top])]
+
+        results = []
+        for i in top:
+            key = self._keys[rows[i] if rows is not None else i]
+            if exclude and key in exclude:
+                continue
+            results.append((key, float(scores[i])))
+            if len(results) == k:
+                break
+        return results
@@ -8,10 +8,10 @@ import logging
 import uvicorn
 import motor.motor_asyncio
 import os
-import httpx
 from fastapi.middleware.cors import CORSMiddleware
 from uuid import uuid4
 from dotenv import load_dotenv
+from services.llm_client import llm_clients
 from fastapi.responses import StreamingResponse
 import io
 import csv
@@ -26,6 +26,11 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 logging.basicConfig(level=logging.INFO)
 
 app = FastAPI()
+
+@app.on_event("shutdown")
+async def close_llm_client():
+    await llm_clients.aclose()
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:5173"],
@@ -92,10 +97,12 @@ async def detect_persona_with_llama(resume_text: str, job: dict) -> str:
             {"role": "user", "content": prompt}
         ]
     }
-    async with httpx.AsyncClient() as client:
-        response = await client.post("https://api.groq.com/openai/v1/chat/completions", headers=headers, json=json_data)
-        response.raise_for_status()
-        return response.json()['choices'][0]['message']['content'].strip()
+    # One shared keep-alive pool instead of a new client (and TLS handshake) per call
+    response = await llm_clients.http_client.post(
+        "https://api.groq.com/openai/v1/chat/completions", headers=headers, json=json_data, timeout=llm_clients.timeout("persona")
+    )
+    response.raise_for_status()
+    return response.json()['choices'][0]['message']['content'].strip()
 
 async def generate_interview_tasks_with_llama(resume_text: str, job: dict) -> List[str]:
     prompt = f"""
@@ -119,16 +126,17 @@ async def generate_interview_tasks_with_llama(resume_text: str, job: dict) -> Li
             {"role": "user", "content": prompt}
         ]
     }
-    async with httpx.AsyncClient() as client:
-        response = await client.post("https://api.groq.com/openai/v1/chat/completions", headers=headers, json=json_data)
-        response.raise_for_status()
-        content = response.json()['choices'][0]['message']['content'].strip()
-        # Extract only the numbered tasks
-        tasks = re.findall(r"\d+\.\s*(.+)", content)
-        if not tasks:
-            # fallback: split by lines and clean
-            tasks = [line.strip("-* ") for line in content.split("\n") if line.strip()]
-        return tasks
+    response = await llm_clients.http_client.post(
+        "https://api.groq.com/openai/v1/chat/completions", headers=headers, json=json_data, timeout=llm_clients.timeout("interview")
+    )
+    response.raise_for_status()
+    content = response.json()['choices'][0]['message']['content'].strip()
+    # Extract only the numbered tasks
+    tasks = re.findall(r"\d+\.\s*(.+)", content)
+    if not tasks:
+        # fallback: split by lines and clean
+        tasks = [line.strip("-* ") for line in content.split("\n") if line.strip()]
+    return tasks
 
 async def score_resume_with_sbert(resume_text: str, job_requirements: List[str]) -> float:
     try:
@@ -179,25 +187,26 @@ async def generate_performance_review_with_llama(resume_text: str, job: dict) ->
             {"role": "user", "content": prompt}
         ]
     }
-    async with httpx.AsyncClient() as client:
-        response = await client.post("https://api.groq.com/openai/v1/chat/completions", headers=headers, json=json_data)
-        response.raise_for_status()
-        content = response.json()['choices'][0]['message']['content'].strip()
-        # Try to parse as JSON directly
-        try:
-            return json.loads(content)
-        except Exception:
-            # Try to extract JSON from triple backticks or anywhere in the text
-            match = re.search(r"```(?:json)?\s*({[\s\S]+?})\s*```", content)
-            if not match:
-                match = re.search(r"({[\s\S]+})", content)
-            if match:
-                try:
-                    return json.loads(match.group(1))
-                except Exception:
-                    pass
-            # fallback: return as plain review if parsing fails
-            return {"review": content, "metrics": {}}
+    response = await llm_clients.http_client.post(
+        "https://api.groq.com/openai/v1/chat/completions", headers=headers, json=json_data, timeout=llm_clients.timeout("performance")
+    )
+    response.raise_for_status()
+    content = response.json()['choices'][0]['message']['content'].strip()
+    # Try to parse as JSON directly
+    try:
+        return json.loads(content)
+    except Exception:
+        # Try to extract JSON from triple backticks or anywhere in the text
+        match = re.search(r"```(?:json)?\s*({[\s\S]+?})\s*```", content)
+        if not match:
+            match = re.search(r"({[\s\S]+})", content)
+        if match:
+            try:
+                return json.loads(match.group(1))
+            except Exception:
+                pass
+        # fallback: return as plain review if parsing fails
+        return {"review": content, "metrics": {}}
     
 # --- API Endpoints ---
 
@@ -407,8 +416,9 @@ async def ai_insights(job_id: str):
             {"role": "user", "content": prompt}
         ]
     }
-    async with httpx.AsyncClient() as client:
-        response = await client.post("https://api.groq.com/openai/v1/chat/completions", headers=headers, json=json_data)
-        response.raise_for_status()
-        content = response.json()['choices'][0]['message']['content'].strip()
-        return {"insight": content} 
\ No newline at end of file
+    response = await llm_clients.http_client.post(
+        "https://api.groq.com/openai/v1/chat/completions", headers=headers, json=json_data, timeout=llm_clients.timeout("insights")
+    )
+    response.raise_for_status()
+    content = response.json()['choices'][0]['message']['content'].strip()
+    return {"insight": content} 
\ No newline at end of file
@@ -0,0 +1,20 @@
+import React from 'react';
+import { useRecruitment } from '../../contexts/RecruitmentContext';
+import Button from './Button';
+
+// Candidates arrive a page at a time; shown under candidate lists while more pages remain
+const LoadMoreCandidates: React.FC = () => {
+  const { hasMoreCandidates, loadMoreCandidates, loading } = useRecruitment();
+
+  if (!hasMoreCandidates) return null;
+
+  return (
+    <div className="pt-4 text-center">
+      <Button variant="outline" size="sm" isLoading={loading} onClick={loadMoreCandidates}>
+        Load more candidates
+      </Button>
+    </div>
+  );
+};
+
+export default LoadMoreCandidates;
@@ -8,6 +8,8 @@ interface StatusBadgeProps {
 const StatusBadge: React.FC<StatusBadgeProps> = ({ status, className = '' }) => {
   const getStatusConfig = (status: string) => {
     const statusMap: Record<string, { color: string; label: string }> = {
+      processing: { color: 'bg-indigo-100 text-indigo-800', label: 'Processing' },
+      failed: { color: 'bg-red-100 text-red-800', label: 'Failed' },
       applied: { color: 'bg-gray-100 text-gray-800', label: 'Applied' },
       screened: { color: 'bg-blue-100 text-blue-800', label: 'Screened' },
       interview: { color: 'bg-amber-100 text-amber-800', label: 'Interview' },
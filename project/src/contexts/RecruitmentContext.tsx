@@ -12,6 +12,7 @@ import {
 interface RecruitmentContextType {
   jobs: Job[];
   candidates: Candidate[];
+  hasMoreCandidates: boolean;
   loading: boolean;
   error: string | null;
   addJob: (job: JobFormData) => Promise<void>;
@@ -19,6 +20,7 @@ interface RecruitmentContextType {
   removeJob: (jobId: string) => Promise<void>;
   updateCandidate: (candidateId: string, status: string) => Promise<void>;
   refreshData: () => Promise<void>;
+  loadMoreCandidates: () => Promise<void>;
 }
 
 const RecruitmentContext = createContext<RecruitmentContextType | undefined>(undefined);
@@ -26,18 +28,21 @@ const RecruitmentContext = createContext<RecruitmentContextType | undefined>(und
 export const RecruitmentProvider: React.FC<{ children: React.ReactNode }> = ({ children }) => {
   const [jobs, setJobs] = useState<Job[]>([]);
   const [candidates, setCandidates] = useState<Candidate[]>([]);
+  const [candidatesNextAfter, setCandidatesNextAfter] = useState<string | undefined>(undefined);
   const [loading, setLoading] = useState<boolean>(true);
   const [error, setError] = useState<string | null>(null);
 
   const loadData = async () => {
     try {
       setLoading(true);
-      const [jobsData, candidatesData] = await Promise.all([
+      // Only the first page of candidates; loadMoreCandidates fetches the rest on demand
+      const [jobsData, candidatesPage] = await Promise.all([
         fetchJobs(),
         fetchCandidates()
       ]);
       setJobs(jobsData);
-      setCandidates(candidatesData);
+      setCandidates(candidatesPage.items);
+      setCandidatesNextAfter(candidatesPage.nextAfter);
     } catch (err) {
       setError('Failed to load data. Please try again later.');
       console.error(err);
@@ -93,7 +98,10 @@ export const RecruitmentProvider: React.FC<{ children: React.ReactNode }> = ({ c
     try {
       setLoading(true);
       await updateCandidateStatus(candidateId, status);
-      await loadData(); // Refresh data after updating candidate
+      // Patched in place so the pages loaded so far are kept
+      setCandidates((current) =>
+        current.map((c) => (c.candidate_id === candidateId ? { ...c, status } as Candidate : c))
+      );
     } catch (err) {
       setError('Failed to update candidate status. Please try again.');
       console.error(err);
@@ -106,18 +114,35 @@ export const RecruitmentProvider: React.FC<{ children: React.ReactNode }> = ({ c
     await loadData();
   };
 
+  const loadMoreCandidates = async () => {
+    if (!candidatesNextAfter) return;
+    try {
+      setLoading(true);
+      const page = await fetchCandidates(candidatesNextAfter);
+      setCandidates((current) => [...current, ...page.items]);
+      setCandidatesNextAfter(page.nextAfter);
+    } catch (err) {
+      setError('Failed to load more candidates. Please try again.');
+      console.error(err);
+    } finally {
+      setLoading(false);
+    }
+  };
+
   return (
     <RecruitmentContext.Provider 
       value={{ 
         jobs, 
         candidates, 
+        hasMoreCandidates: candidatesNextAfter !== undefined,
         loading, 
         error, 
         addJob, 
         updateJobDetails, 
         removeJob, 
         updateCandidate,
-        refreshData
+        refreshData,
+        loadMoreCandidates
       }}
     >
       {children}
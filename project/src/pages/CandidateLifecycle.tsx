@@ -3,6 +3,7 @@ import { useRecruitment } from '../contexts/RecruitmentContext';
 import Card from '../components/ui/Card';
 import Button from '../components/ui/Button';
 import StatusBadge from '../components/ui/StatusBadge';
+import LoadMoreCandidates from '../components/ui/LoadMoreCandidates';
 import { ChevronLeft, ChevronRight, Users, Search, Calendar } from 'lucide-react';
 
 type CandidateStatus = 'applied' | 'screened' | 'interview' | 'offer' | 'onboarded' | 'rejected';
@@ -209,6 +210,7 @@ const CandidateLifecycle: React.FC = () => {
           })}
         </div>
       </div>
+      <LoadMoreCandidates />
       
       {/* Timeline view */}
       <Card title="Candidate Timeline">
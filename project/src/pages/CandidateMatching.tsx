@@ -1,9 +1,11 @@
-import React, { useState } from 'react';
+import React, { useEffect, useState } from 'react';
 import { useRecruitment } from '../contexts/RecruitmentContext';
 import Card from '../components/ui/Card';
 import Button from '../components/ui/Button';
 import StatusBadge from '../components/ui/StatusBadge';
+import LoadMoreCandidates from '../components/ui/LoadMoreCandidates';
 import { Check, X, Calendar, User, Search, Filter } from 'lucide-react';
+import { fetchCandidate } from '../utils/api';
 
 const CandidateMatching: React.FC = () => {
   const [isScheduleModalOpen, setIsScheduleModalOpen] = useState(false);
@@ -14,6 +16,22 @@ const CandidateMatching: React.FC = () => {
   const [searchTerm, setSearchTerm] = useState('');
   const [statusFilter, setStatusFilter] = useState<string[]>([]);
   const [activeCandidate, setActiveCandidate] = useState<string | null>(null);
+  const [activeResumeText, setActiveResumeText] = useState<string | null>(null);
+
+  // The candidate list omits resume_text to stay small; load it only for the open candidate
+  useEffect(() => {
+    setActiveResumeText(null);
+    if (!activeCandidate) return;
+    let cancelled = false;
+    fetchCandidate(activeCandidate)
+      .then((candidate) => {
+        if (!cancelled) setActiveResumeText(candidate.resume_text || null);
+      })
+      .catch(() => {});
+    return () => {
+      cancelled = true;
+    };
+  }, [activeCandidate]);
 
   const toggleStatusFilter = (status: string) => {
     if (statusFilter.includes(status)) {
@@ -191,6 +209,7 @@ const CandidateMatching: React.FC = () => {
                 ))
               )}
             </div>
+            <LoadMoreCandidates />
           </Card>
         </div>
         
@@ -318,9 +337,9 @@ const CandidateMatching: React.FC = () => {
                     )}
                     
                     {/* Resume text */}
-                    {candidate.resume_text && (
+                    {activeResumeText && (
                       <Card title="Resume Text" contentClassName="max-h-64 overflow-y-auto">
-                        <p className="text-sm text-gray-700 whitespace-pre-line">{candidate.resume_text}</p>
+                        <p className="text-sm text-gray-700 whitespace-pre-line">{activeResumeText}</p>
                       </Card>
                     )}
                   </>
@@ -5,6 +5,7 @@ import Card from '../components/ui/Card';
 import Button from '../components/ui/Button';
 import StatusBadge from '../components/ui/StatusBadge';
 import { Briefcase, Users, CheckCircle, Clock, BarChart3 } from 'lucide-react';
+import { fetchDashboardStats } from '../utils/api';
 
 const Dashboard: React.FC = () => {
   const { jobs, candidates } = useRecruitment();
@@ -17,19 +18,17 @@ const Dashboard: React.FC = () => {
   });
 
   useEffect(() => {
-    // Calculate dashboard stats
-    const statusCounts = candidates.reduce((acc, candidate) => {
-      const status = candidate.status;
-      acc[status] = (acc[status] || 0) + 1;
-      return acc;
-    }, {} as Record<string, number>);
-
-    setStats({
-      totalJobs: jobs.length,
-      totalCandidates: candidates.length,
-      activeJobs: jobs.length, // For demo, all jobs are active
-      statusCounts,
-    });
+    // Counts come precomputed from the server's job stats; refetch whenever the lists change
+    fetchDashboardStats()
+      .then((summary) => {
+        setStats({
+          totalJobs: jobs.length,
+          totalCandidates: summary.totalCandidates,
+          activeJobs: jobs.length, // For demo, all jobs are active
+          statusCounts: summary.statusBreakdown,
+        });
+      })
+      .catch((error) => console.error('Error fetching dashboard stats:', error));
   }, [jobs, candidates]);
 
   return (
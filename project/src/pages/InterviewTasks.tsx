@@ -3,6 +3,7 @@ import { useRecruitment } from '../contexts/RecruitmentContext';
 import Card from '../components/ui/Card';
 import Button from '../components/ui/Button';
 import StatusBadge from '../components/ui/StatusBadge';
+import LoadMoreCandidates from '../components/ui/LoadMoreCandidates';
 import { RefreshCw, Edit, Check, Calendar } from 'lucide-react';
 import { API_URL } from '../utils/api';
 
@@ -139,6 +140,7 @@ const InterviewTasks: React.FC = () => {
                 ))
               )}
             </div>
+            <LoadMoreCandidates />
           </Card>
         </div>
         
@@ -3,6 +3,7 @@ import { useRecruitment } from '../contexts/RecruitmentContext';
 import Card from '../components/ui/Card';
 import Button from '../components/ui/Button';
 import StatusBadge from '../components/ui/StatusBadge';
+import LoadMoreCandidates from '../components/ui/LoadMoreCandidates';
 import { Download, FileText, Star, Edit, Check } from 'lucide-react';
 
 const PerformanceReview: React.FC = () => {
@@ -108,6 +109,7 @@ const PerformanceReview: React.FC = () => {
                 ))
               )}
             </div>
+            <LoadMoreCandidates />
           </Card>
         </div>
         
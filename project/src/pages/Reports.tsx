@@ -4,7 +4,7 @@ import Card from '../components/ui/Card';
 import Button from '../components/ui/Button';
 import StatusBadge from '../components/ui/StatusBadge';
 import { BarChart3, FileText, DownloadCloud, PieChart, Users } from 'lucide-react';
-import { API_URL } from '../utils/api';
+import { API_URL, streamLlmField } from '../utils/api';
 
 
 
@@ -18,10 +18,14 @@ const Reports: React.FC = () => {
 
   useEffect(() => {
   if (!reportData) return;
-  fetch(`${API_URL}/ai_insights?job_id=${reportData.job.job_id}`)
-    .then(res => res.json())
-    .then(data => setAiInsight(data.insight))
-    .catch(() => setAiInsight("Failed to generate AI insight."));
+  // Stream the insight so the first words show up while the rest is still being generated
+  setAiInsight(null);
+  return streamLlmField<{ insight: string }>(
+    `/ai_insights/stream?job_id=${reportData.job.job_id}`,
+    (text) => setAiInsight(prev => (prev || '') + text),
+    (data) => setAiInsight(data.insight),
+    () => setAiInsight(prev => prev || "Failed to generate AI insight.")
+  );
 }, [reportData]);
 
   const handleGenerateReport = async () => {
@@ -139,6 +143,15 @@ const Reports: React.FC = () => {
                 >
                   Export as CSV
                 </Button>
+                <Button
+                  variant="outline"
+                  size="sm"
+                  icon={<DownloadCloud size={16} />}
+                  onClick={() => handleExportReport('parquet')}
+                  disabled={!selectedJobId}
+                >
+                  Export as Parquet
+                </Button>
               </div>
             </div>
           </Card>
@@ -16,7 +16,7 @@ export interface Candidate {
   candidate_id: string;
   name: string;
   resume_text?: string;
-  status: 'applied' | 'screened' | 'interview' | 'offer' | 'onboarded' | 'rejected';
+  status: 'processing' | 'failed' | 'applied' | 'screened' | 'interview' | 'offer' | 'onboarded' | 'rejected';
   score?: number;
   persona?: string;
   interview_tasks?: string[];
@@ -29,14 +29,34 @@ export interface Candidate {
 
 export interface ResumeUploadResponse {
   message: string;
+  processing_id?: string;
   candidate: Candidate;
 }
 
+export interface ProcessingStatus {
+  processing_id: string;
+  status: 'queued' | 'running' | 'done' | 'dead';
+  attempts: number;
+  error: string | null;
+  candidate_id: string;
+  candidate: Candidate | null;
+}
+
 export interface StatusUpdate {
   candidateId: string;
   status: string;
 }
 
+export interface JobStatsSummary {
+  totalCandidates: number;
+  averageScore: number;
+  scoredCandidates: number;
+  statusBreakdown: Record<string, number>;
+  scoreHistogram: { min: number; max: number; count: number }[];
+  averageMetrics: Record<string, number>;
+  totalJobs?: number;
+}
+
 export interface DashboardStats {
   totalJobs: number;
   totalCandidates: number;
@@ -57,6 +77,12 @@ export interface ReportData {
     totalCandidates: number;
     averageScore: number;
     statusBreakdown: Record<string, number>;
+    scoredCandidates?: number;
+    averageMetrics?: Record<string, number>;
+    minScore?: number | null;
+    maxScore?: number | null;
+    scoreHistogram?: { min: number; max: number; count: number }[];
+    scorePercentiles?: Record<string, number | null>;
   };
 }
 
@@ -1,13 +1,42 @@
 import axios, { AxiosError } from 'axios';
-import { Job, Candidate, JobFormData, ResumeUploadResponse, StatusUpdate } from '../types';
+import { Job, Candidate, JobFormData, ResumeUploadResponse, ProcessingStatus, StatusUpdate, JobStatsSummary } from '../types';
 
 export const API_URL = 'http://localhost:8000';
 const api = axios.create({ baseURL: API_URL });
+const PROCESSING_POLL_INTERVAL_MS = 2000;
+// Give up waiting after this long; the resume keeps processing and shows up in the candidate list
+const PROCESSING_TIMEOUT_MS = 5 * 60 * 1000;
+const PAGE_SIZE = 500;
+// Candidates are loaded a page at a time as the user asks for more; the collection grows without bound
+export const CANDIDATE_PAGE_SIZE = 100;
 
+export interface Page<T> {
+  items: T[];
+  // Cursor for the following page; undefined on the last one
+  nextAfter?: string;
+}
+
+// List endpoints are keyset-paginated: the next page's cursor comes back in the X-Next-After header
+const fetchPage = async <T>(path: string, limit: number, after?: string): Promise<Page<T>> => {
+  const response = await api.get(path, { params: { limit, after } });
+  return { items: response.data, nextAfter: response.headers['x-next-after'] };
+};
+
+const fetchAllPages = async <T>(path: string): Promise<T[]> => {
+  const items: T[] = [];
+  let after: string | undefined;
+  do {
+    const page = await fetchPage<T>(path, PAGE_SIZE, after);
+    items.push(...page.items);
+    after = page.nextAfter;
+  } while (after);
+  return items;
+};
+
+// Jobs are few and every job picker needs the complete list, so they are still loaded in full
 export const fetchJobs = async (): Promise<Job[]> => {
   try {
-    const response = await api.get('/jobs');
-    return response.data;
+    return await fetchAllPages<Job>('/jobs');
   } catch (error) {
     const axiosError = error as AxiosError;
     if (axiosError.response) {
@@ -21,9 +50,25 @@ export const fetchJobs = async (): Promise<Job[]> => {
   }
 };
 
-export const fetchCandidates = async (): Promise<Candidate[]> => {
+export const fetchCandidates = async (after?: string): Promise<Page<Candidate>> => {
   try {
-    const response = await api.get('/candidates');
+    return await fetchPage<Candidate>('/candidates', CANDIDATE_PAGE_SIZE, after);
+  } catch (error) {
+    const axiosError = error as AxiosError;
+    if (axiosError.response) {
+      console.error('Server responded with error:', axiosError.response.data);
+    } else if (axiosError.request) {
+      console.error('No response received from server. Check if the server is running at:', API_URL);
+    } else {
+      console.error('Error setting up request:', axiosError.message);
+    }
+    throw error;
+  }
+};
+
+export const fetchCandidate = async (candidateId: string): Promise<Candidate> => {
+  try {
+    const response = await api.get(`/candidates/${candidateId}`);
     return response.data;
   } catch (error) {
     const axiosError = error as AxiosError;
@@ -106,6 +151,80 @@ export const uploadResume = async (
         'Content-Type': 'multipart/form-data',
       },
     });
+
+    // The server queues the resume and answers 202 right away; poll until the pipeline finishes
+    const processingId: string = response.data.processing_id;
+    const deadline = Date.now() + PROCESSING_TIMEOUT_MS;
+    while (Date.now() < deadline) {
+      const processing = await fetchProcessingStatus(processingId);
+      if (processing.status === 'done') {
+        if (!processing.candidate) {
+          // Finished, but the candidate was deleted in the meantime
+          throw new Error('Candidate no longer exists');
+        }
+        return { message: 'Candidate processed', processing_id: processingId, candidate: processing.candidate };
+      }
+      if (processing.status === 'dead') {
+        throw new Error(processing.error || 'Resume processing failed');
+      }
+      await new Promise((resolve) => setTimeout(resolve, PROCESSING_POLL_INTERVAL_MS));
+    }
+    throw new Error('Resume is still processing; check the candidate list later');
+  } catch (error) {
+    const axiosError = error as AxiosError;
+    if (axiosError.response) {
+      console.error('Server responded with error:', axiosError.response.data);
+    } else if (axiosError.request) {
+      console.error('No response received from server. Check if the server is running at:', API_URL);
+    } else {
+      console.error('Error setting up request:', axiosError.message);
+    }
+    throw error;
+  }
+};
+
+export const fetchProcessingStatus = async (processingId: string): Promise<ProcessingStatus> => {
+  try {
+    const response = await api.get(`/processing/${processingId}`);
+    return response.data;
+  } catch (error) {
+    const axiosError = error as AxiosError;
+    if (axiosError.response) {
+      console.error('Server responded with error:', axiosError.response.data);
+    } else if (axiosError.request) {
+      console.error('No response received from server. Check if the server is running at:', API_URL);
+    } else {
+      console.error('Error setting up request:', axiosError.message);
+    }
+    throw error;
+  }
+};
+
+// Server-Sent Events: LLM text arrives as "token" events, the persisted result as a final "done" event
+export const streamLlmField = <T>(
+  path: string,
+  onToken: (text: string) => void,
+  onDone: (result: T) => void,
+  onError: (detail: string) => void
+): (() => void) => {
+  const source = new EventSource(`${API_URL}${path}`);
+  source.addEventListener('token', (event) => onToken(JSON.parse((event as MessageEvent).data).text));
+  source.addEventListener('done', (event) => {
+    source.close();
+    onDone(JSON.parse((event as MessageEvent).data));
+  });
+  source.addEventListener('error', (event) => {
+    source.close();
+    const data = (event as MessageEvent).data;
+    onError(data ? JSON.parse(data).detail : 'Connection to the server was lost');
+  });
+  return () => source.close();
+};
+
+// Served from per-job counters, so the cost does not grow with the number of candidates
+export const fetchDashboardStats = async (): Promise<JobStatsSummary> => {
+  try {
+    const response = await api.get('/stats');
     return response.data;
   } catch (error) {
     const axiosError = error as AxiosError;